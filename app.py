@@ -1,37 +1,187 @@
-from flask import Flask, render_template, request, jsonify, session, redirect, url_for
-from flask_bcrypt import Bcrypt
+from flask import Flask, render_template, request, jsonify, session, redirect, url_for, g, abort, has_request_context
+from werkzeug.middleware.proxy_fix import ProxyFix
+from markupsafe import escape, Markup
 import mysql.connector
-from mysql.connector import pooling
-from datetime import datetime
+from datetime import datetime, timedelta
+import json
 import sys
+import click
 from functools import wraps
 import os
+import re
+import zlib
 from config import Config
+from cache import make_cache
+from events import make_broker
+from auth import PasswordHasher, TokenBucketLimiter, HashingBusy
+from db import ConnectionPool, PoolTimeout
+from metrics import RequestMetrics
+from sessions import ServerSideSessionInterface
+import compression
+import assets
 
 app = Flask(__name__)
 app.config.from_object(Config)
-bcrypt = Bcrypt(app)
-
-# Database Connection Pool
-db_pool = None
-try:
-    db_pool = mysql.connector.pooling.MySQLConnectionPool(
-        pool_name="saas_pool",
-        pool_size=5,
+if app.config['TRUSTED_PROXY_COUNT']:
+    app.wsgi_app = ProxyFix(app.wsgi_app, x_for=app.config['TRUSTED_PROXY_COUNT'], x_proto=app.config['TRUSTED_PROXY_COUNT'])
+
+password_hasher = PasswordHasher(rounds=app.config['BCRYPT_LOG_ROUNDS'], workers=app.config['AUTH_HASH_WORKERS'], queue_depth=app.config['AUTH_HASH_QUEUE_DEPTH'],
+                                 timeout=app.config['AUTH_HASH_TIMEOUT'], executor=app.config['AUTH_HASH_EXECUTOR'])
+ip_limiter = TokenBucketLimiter(app.config['AUTH_RATE_PER_IP'], app.config['AUTH_BURST_PER_IP'])
+email_limiter = TokenBucketLimiter(app.config['AUTH_RATE_PER_EMAIL'], app.config['AUTH_BURST_PER_EMAIL'])
+
+request_metrics = RequestMetrics(slow_request_ms=app.config['SLOW_REQUEST_MS'])
+request_metrics.init_app(app)
+compression.init_app(app)
+assets.init_app(app)
+app.session_interface = ServerSideSessionInterface(make_cache(app.config, 'sessions', app.config['SESSION_MAX_COUNT'], app.config['SESSION_LIFETIME'], backend=app.config['SESSION_BACKEND']),
+                                                   make_cache(app.config, 'session_cutoffs', app.config['SESSION_MAX_COUNT'], app.config['SESSION_LIFETIME'], backend=app.config['SESSION_BACKEND']),
+                                                   lifetime=app.config['SESSION_LIFETIME'], refresh_interval=app.config['SESSION_REFRESH_INTERVAL'])
+
+# Database Connection Pool. Connections are opened on first use, so the app boots even while MySQL is still starting.
+def connect_mysql():
+    return mysql.connector.connect(
         host=app.config['MYSQL_HOST'],
-        port=os.environ.get('MYSQL_PORT'),
+        port=app.config['MYSQL_PORT'],
         user=app.config['MYSQL_USER'],
         password=app.config['MYSQL_PASSWORD'],
-        database=app.config['MYSQL_DB']
+        database=app.config['MYSQL_DB'],
+        connection_timeout=app.config['DB_CONNECT_TIMEOUT']
     )
-    print("--- Database connection pool created successfully. ---")
-except Exception as e:
-    print(f"---!!! FAILED TO CREATE DATABASE CONNECTION POOL: {e} !!!---", file=sys.stderr)
+
+db_pool = ConnectionPool(
+    connect_mysql,
+    size=app.config['DB_POOL_SIZE'],
+    max_overflow=app.config['DB_POOL_MAX_OVERFLOW'],
+    timeout=app.config['DB_POOL_TIMEOUT'],
+    recycle=app.config['DB_POOL_RECYCLE'],
+    ping_after=app.config['DB_POOL_PING_AFTER'],
+    connect_retries=app.config['DB_CONNECT_RETRIES'],
+    cursor_hook=request_metrics.instrument_cursor
+)
+
+user_context_cache = make_cache(app.config, 'user_context', app.config['USER_CONTEXT_CACHE_SIZE'], app.config['USER_CONTEXT_TTL'])
 
 def get_db_connection():
-    if not db_pool:
-        raise Exception("Database pool is not available.")
-    return db_pool.get_connection()
+    # Reuse the connection project_member_required already checked out for this request, if any. Its reads are ended
+    # first: under REPEATABLE READ the route would otherwise keep their snapshot, and read stale rows after taking a lock.
+    connection = g.pop('db_connection', None)
+    if connection is None: return db_pool.get_connection()
+    connection.rollback()
+    return connection
+
+@app.errorhandler(PoolTimeout)
+def database_busy(e):
+    print(f"Database pool exhausted: {e}", file=sys.stderr)
+    response = jsonify({'error': 'The server is busy. Please try again in a moment.'})
+    response.headers['Retry-After'] = '1'
+    return response, 503
+
+@app.teardown_request
+def release_db_connection(exc):
+    # A handed-off connection the handler never claimed (e.g. a redirect) goes back to the pool here.
+    connection = g.pop('db_connection', None)
+    if connection is not None and connection.is_connected(): connection.close()
+
+USER_CONTEXT_QUERY = "SELECT u.id, u.name, u.email, pm.project_id, pm.role FROM users u LEFT JOIN project_members pm ON pm.user_id = u.id WHERE u.id = %s"
+
+def build_user_context(rows):
+    # {'id', 'name', 'email', 'projects': {project_id: role}}; keys are strings so the context survives JSON backends.
+    if not rows: return None
+    user = rows[0]
+    return {'id': user['id'], 'name': user['name'], 'email': user['email'],
+            'projects': {str(row['project_id']): row['role'] for row in rows if row['project_id'] is not None}}
+
+# Request logic shared with the async routes of asgi.py is written as "reads" generators: each read is yielded as
+# (query, params) and answered with its rows, and the generator returns the result. run_reads drives them here.
+
+def run_reads(reads, cur=None, hand_off=False):
+    # Without a cursor, a connection is checked out only once a read comes; it is closed afterwards, or with hand_off
+    # left for the route (see get_db_connection) instead of paying for a second checkout.
+    connection = None
+    try:
+        step = next(reads)
+        while True:
+            if cur is None:
+                connection = get_db_connection()
+                cur = connection.cursor(dictionary=True)
+            cur.execute(*step)
+            step = reads.send(cur.fetchall())
+    except StopIteration as done:
+        return done.value
+    finally:
+        if connection is not None:
+            cur.close()
+            if hand_off: g.db_connection = connection
+            elif connection.is_connected(): connection.close()
+
+def user_context_reads(user_id):
+    context = user_context_cache.get(user_id)
+    if context is None:
+        context = build_user_context((yield USER_CONTEXT_QUERY, (user_id,)))
+        if context is not None: user_context_cache.set(user_id, context)
+    return context
+
+def membership_reads(project_id):
+    # login_required and project_member_required: a redirect for visitors who may not see the project, otherwise None.
+    if not session.get('logged_in'): return redirect(url_for('index'))
+    user_id = session.get('user_id')
+    if not all([project_id, user_id]): return redirect(url_for('projects'))
+    context = yield from user_context_reads(user_id)
+    return None if context is not None and str(project_id) in context['projects'] else redirect(url_for('projects'))
+
+def load_user_context(user_id):
+    return run_reads(user_context_reads(user_id), hand_off=True)
+
+def current_user():
+    user_id = session.get('user_id')
+    return load_user_context(user_id) if user_id else None
+
+def invalidate_user_context(user_id):
+    user_context_cache.delete(user_id)
+
+event_broker = make_broker(app.config)
+
+# Serialized task lists, one entry per project and query string: {'version': v, 'body': JSON}. A write stores the
+# project's new version under a marker key; pages older than the marker are stale, and a reader that loaded an
+# older snapshot can't store it back.
+board_cache = make_cache(app.config, 'board', app.config['BOARD_CACHE_SIZE'], app.config['BOARD_CACHE_TTL'])
+board_lookups = {'hits': 0, 'misses': 0}  # counted here, since a page behind the marker is a miss too
+
+def board_page_key(project_id):
+    return f"{project_id}:{request.query_string.decode()}"
+
+def board_marker(project_id):
+    return board_cache.peek(f"{project_id}:version", 0)
+
+def cached_board_page(project_id):
+    page = board_cache.get(board_page_key(project_id))
+    if page is None or page['version'] < board_marker(project_id):
+        board_lookups['misses'] += 1
+        return None, None
+    board_lookups['hits'] += 1
+    return page['version'], page['body']
+
+def store_board_page(project_id, version, body):
+    if version < board_marker(project_id): return
+    board_cache.set(board_page_key(project_id), {'version': version, 'body': body})
+
+def invalidate_board(project_id, version):
+    board_cache.set(f"{project_id}:version", version)
+
+def board_cache_stats():
+    lookups = board_lookups['hits'] + board_lookups['misses']
+    return {**board_cache.stats(), **board_lookups, 'hit_rate': round(board_lookups['hits'] / lookups, 4) if lookups else None}
+
+def notify_board_change(project_id, event_type, **fields):
+    # Called after a board write has committed; subscribers of /projects/<id>/events receive it.
+    actor_id = session.get('user_id') if has_request_context() else None
+    event = {'type': event_type, 'project_id': project_id, 'actor_id': actor_id, **fields}
+    if 'version' in fields: invalidate_board(project_id, fields['version'])
+    try:
+        event_broker.publish(project_id, event)
+    except Exception as e:
+        print(f"Error publishing {event_type} for project {project_id}: {e}", file=sys.stderr)
 
 def login_required(f):
     @wraps(f)
@@ -43,16 +193,31 @@ def login_required(f):
 def project_member_required(f):
     @wraps(f)
     def decorated_function(*args, **kwargs):
-        project_id = kwargs.get('project_id')
-        user_id = session.get('user_id')
-        if not all([project_id, user_id]): return redirect(url_for('projects'))
-        connection = get_db_connection()
-        cur = connection.cursor()
-        cur.execute("SELECT project_id FROM project_members WHERE project_id = %s AND user_id = %s", (project_id, user_id))
-        member = cur.fetchone()
-        cur.close()
-        connection.close()
-        if not member: return redirect(url_for('projects'))
+        denied = run_reads(membership_reads(kwargs.get('project_id')), hand_off=True)
+        if denied: return denied
+        return f(*args, **kwargs)
+    return decorated_function
+
+def cache_validator(kind, key, version):
+    # Strong ETag for a response derived from a change version; the query string picks the representation.
+    return f"{kind}{key}-v{version}-{zlib.crc32(request.query_string):x}"
+
+def not_modified(etag):
+    # 304 when the client already holds this version (in any of its content encodings), otherwise None.
+    if not any(request.if_none_match.contains(candidate) for candidate in (etag, f"{etag}-gzip", f"{etag}-br")): return None
+    return with_validator(app.response_class(status=304), etag)
+
+def with_validator(response, etag):
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response
+
+def admin_required(f):
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        token = app.config.get('ADMIN_TOKEN')
+        supplied = request.headers.get('X-Admin-Token') or request.headers.get('Authorization', '').removeprefix('Bearer ')
+        if not token or supplied != token: abort(404)
         return f(*args, **kwargs)
     return decorated_function
 
@@ -67,13 +232,14 @@ def projects():
     connection = None
     try:
         user_id = session['user_id']
+        user = current_user()
         connection = get_db_connection()
         cur = connection.cursor(dictionary=True)
         query = "SELECT p.id, p.name, u.name as owner_name FROM projects p JOIN project_members pm ON p.id = pm.project_id JOIN users u ON p.owner_id = u.id WHERE pm.user_id = %s"
         cur.execute(query, (user_id,))
         user_projects = cur.fetchall()
         cur.close()
-        return render_template('projects.html', projects=user_projects, user_name=session.get('user_name'))
+        return render_template('projects.html', projects=user_projects, user_name=user['name'])
     except Exception as e:
         print(f"Error fetching projects: {e}", file=sys.stderr)
         return "Error loading projects.", 500
@@ -92,7 +258,7 @@ def dashboard(project_id):
         project = cur.fetchone()
         cur.close()
         if not project: return redirect(url_for('projects'))
-        return render_template('dashboard.html', user_name=session.get('user_name'), project=project, project_id=project_id)
+        return render_template('dashboard.html', user_name=current_user()['name'], project=project, project_id=project_id)
     except Exception as e:
         print(f"Error fetching project details: {e}", file=sys.stderr)
         return "Error loading board.", 500
@@ -115,6 +281,7 @@ def create_project():
         cur.execute("INSERT INTO project_members (project_id, user_id, role) VALUES (%s, %s, 'owner')", (project_id, user_id))
         connection.commit()
         cur.close()
+        invalidate_user_context(user_id)
         return jsonify({'status': 'success', 'project_id': project_id}), 201
     except Exception as e:
         print(f"Error creating project: {e}", file=sys.stderr)
@@ -130,11 +297,15 @@ def get_members(project_id):
     try:
         connection = get_db_connection()
         cur = connection.cursor(dictionary=True)
+        cur.execute("SELECT version FROM projects WHERE id = %s", (project_id,))
+        etag = cache_validator('m', project_id, cur.fetchone()['version'])
+        cached = not_modified(etag)
+        if cached: return cached
         query = "SELECT u.id as user_id, u.name, u.email, pm.role FROM users u JOIN project_members pm ON u.id = pm.user_id WHERE pm.project_id = %s"
         cur.execute(query, (project_id,))
         members = cur.fetchall()
         cur.close()
-        return jsonify(members)
+        return with_validator(jsonify(members), etag)
     except Exception as e:
         print(f"Error fetching members: {e}", file=sys.stderr)
         return jsonify({'error': 'Could not fetch members'}), 500
@@ -162,8 +333,11 @@ def add_member(project_id):
         if not user_to_invite: return jsonify({'error': 'User with that email does not exist'}), 404
         user_id_to_invite = user_to_invite['id']
         cur.execute("INSERT INTO project_members (project_id, user_id, role) VALUES (%s, %s, 'member')", (project_id, user_id_to_invite))
+        version = bump_board_version(connection, project_id)
         connection.commit()
         cur.close()
+        invalidate_user_context(user_id_to_invite)
+        notify_board_change(project_id, 'member.added', user_id=user_id_to_invite, version=version)
         return jsonify({'status': 'success', 'message': 'User invited successfully!'})
     except Exception as e:
         if '1062' in str(e): return jsonify({'error': 'This user is already a member of the board'}), 409
@@ -172,43 +346,192 @@ def add_member(project_id):
     finally:
         if connection and connection.is_connected(): connection.close()
 
+TASK_STATUSES = ('todo', 'inprogress', 'done')
+
+def bump_board_version(connection, project_id):
+    # Every board write takes the next per-project version inside its own transaction. The row lock on
+    # projects serializes writers, so versions become visible to readers in order.
+    cur = connection.cursor()
+    cur.execute("UPDATE projects SET version = LAST_INSERT_ID(version + 1) WHERE id = %s", (project_id,))
+    cur.execute("SELECT LAST_INSERT_ID()")
+    version = cur.fetchone()[0]
+    cur.close()
+    return version
+
+def touch_task(cur, project_id, task_id, version, comments=0, subtasks=0, subtasks_done=0):
+    # Marks a task as changed when one of its subtasks or comments changes and adjusts its counters in the
+    # same transaction; False if the task is not on this board.
+    cur.execute("UPDATE tasks SET version = %s, comment_count = comment_count + %s, subtask_total = subtask_total + %s, subtask_done = subtask_done + %s WHERE id = %s AND project_id = %s",
+                (version, comments, subtasks, subtasks_done, task_id, project_id))
+    return cur.rowcount > 0
+
+UPDATE_DAILY_STATS = "INSERT INTO project_daily_stats (project_id, day, created, completed, reopened, cycle_seconds) VALUES (%s, %s, %s, %s, %s, %s) ON DUPLICATE KEY UPDATE created = created + VALUES(created), completed = completed + VALUES(completed), reopened = reopened + VALUES(reopened), cycle_seconds = cycle_seconds + VALUES(cycle_seconds)"
+
+# Rollups and the status log are stamped with the database's clock, like created_at and status_changed_at, so
+# cycle times hold when the app and the database run in different time zones.
+RECORD_CREATED = "INSERT INTO project_daily_stats (project_id, day, created, completed, reopened, cycle_seconds) VALUES (%s, CURDATE(), %s, 0, 0, 0) ON DUPLICATE KEY UPDATE created = created + VALUES(created)"
+
+def record_created(connection, project_id, count):
+    cur = connection.cursor()
+    cur.execute(RECORD_CREATED, (project_id, count))
+    cur.close()
+
+def record_status_changes(connection, project_id, moves):
+    # Call before applying moves, [(task_id, status)] in order, in the same transaction: every real change of column
+    # goes to task_status_log, and today's rollup gets the completions (with their cycle time) and reopened tasks.
+    task_ids = tuple({task_id for task_id, _ in moves})
+    cur = connection.cursor()
+    cur.execute(f"SELECT id, status, created_at, NOW() AS now FROM tasks WHERE project_id = %s AND id IN ({in_clause(task_ids)})", (project_id, *task_ids))
+    rows = cur.fetchall()
+    tasks = {task_id: [status, created_at] for task_id, status, created_at, _ in rows}
+    now, changes = rows[0][3] if rows else None, []
+    for task_id, status in moves:
+        if task_id not in tasks or tasks[task_id][0] == status: continue
+        changes.append((project_id, task_id, tasks[task_id][0], status, now))
+        tasks[task_id][0] = status
+    if changes:
+        cur.executemany("INSERT INTO task_status_log (project_id, task_id, from_status, to_status, changed_at) VALUES (%s, %s, %s, %s, %s)", changes)
+        completed = [change[1] for change in changes if change[3] == 'done']
+        started = {}
+        if completed:
+            # A task's cycle starts with its first move to 'inprogress', or at creation if it skipped that column.
+            cur.execute(f"SELECT task_id, changed_at FROM task_status_log WHERE task_id IN ({in_clause(completed)}) AND to_status = 'inprogress' ORDER BY changed_at DESC", tuple(completed))
+            started = dict(cur.fetchall())
+        cycle_seconds = sum(max(int((now - (started.get(task_id) or tasks[task_id][1])).total_seconds()), 0) for task_id in completed)
+        reopened = sum(1 for change in changes if change[2] == 'done')
+        cur.execute(UPDATE_DAILY_STATS, (project_id, now.date(), 0, len(completed), reopened, cycle_seconds))
+    cur.close()
+
+TASK_COUNTERS = {'comment_count': "(SELECT COUNT(*) FROM comments c WHERE c.task_id = tasks.id)",
+                 'subtask_total': "(SELECT COUNT(*) FROM subtasks s WHERE s.task_id = tasks.id)",
+                 'subtask_done': "(SELECT COUNT(*) FROM subtasks s WHERE s.task_id = tasks.id AND s.is_complete)"}
+RECOUNT_TASK_COUNTERS = "UPDATE tasks SET " + ", ".join(f"{column} = {count}" for column, count in TASK_COUNTERS.items())
+DRIFTED_TASKS = "SELECT project_id, id FROM tasks WHERE " + " OR ".join(f"{column} <> {count}" for column, count in TASK_COUNTERS.items())
+
+def in_clause(values):
+    return ', '.join(['%s'] * len(values))
+
+def task_list_query(where, params, limit=None):
+    query = f"SELECT t.id, t.content, t.status, t.priority, t.due_date, t.created_at, t.assignee_id, u.name as assignee_name, t.comment_count, t.subtask_total, t.subtask_done FROM tasks t LEFT JOIN users u ON t.assignee_id = u.id WHERE {where} ORDER BY t.created_at DESC, t.id DESC"
+    if limit is None: return query, params
+    return query + " LIMIT %s", (*params, limit)
+
+def task_details_queries(task_ids):
+    # Subtasks, and the latest comments of every task in one windowed query (oldest first per task, like the thread).
+    subtask_query = f"SELECT id, content, is_complete, task_id FROM subtasks WHERE task_id IN ({in_clause(task_ids)})"
+    preview_query = f"SELECT task_id, author, content FROM (SELECT c.task_id, u.name AS author, SUBSTRING(c.content, 1, 120) AS content, ROW_NUMBER() OVER (PARTITION BY c.task_id ORDER BY c.created_at DESC, c.id DESC) AS position FROM comments c JOIN users u ON c.user_id = u.id WHERE c.task_id IN ({in_clause(task_ids)})) ranked WHERE position <= %s ORDER BY task_id, position DESC"
+    return (subtask_query, task_ids), (preview_query, (*task_ids, app.config['COMMENT_PREVIEW_COUNT']))
+
+def attach_task_details(tasks, subtasks, previews):
+    for task in tasks.values(): task['subtasks'], task['comment_preview'] = [], []
+    for subtask in subtasks:
+        if subtask['task_id'] in tasks: tasks[subtask['task_id']]['subtasks'].append(subtask)
+    for comment in previews:
+        tasks[comment.pop('task_id')]['comment_preview'].append(comment)
+    return tasks
+
+def task_reads(where, params, limit=None):
+    tasks = {task['id']: task for task in (yield task_list_query(where, params, limit))}
+    if not tasks: return tasks
+    subtask_query, preview_query = task_details_queries(tuple(tasks))
+    subtasks = yield subtask_query
+    return attach_task_details(tasks, subtasks, (yield preview_query))
+
+def load_tasks(cur, where, params, limit=None):
+    return run_reads(task_reads(where, params, limit), cur)
+
+def format_task_dates(tasks):
+    for task in tasks:
+        if task.get('due_date'): task['due_date'] = task['due_date'].strftime('%Y-%m-%d')
+        if task.get('created_at'):
+            # The column sort key, in cursor form, so clients can place cards the way pages order them.
+            task['position'] = encode_task_cursor(task)
+            task['created_at'] = task['created_at'].strftime('%b %d, %Y')
+    return tasks
+
+def encode_task_cursor(task, field='created_at'):
+    return f"{task[field].isoformat()},{task['id']}"
+
+def decode_task_cursor(value):
+    created_at, task_id = value.rsplit(',', 1)
+    return datetime.fromisoformat(created_at), int(task_id)
+
+def task_list_args():
+    # (since, status, limit, after) from the query string of a task list request, or an error response.
+    status = request.args.get('status')
+    if status is not None and status not in TASK_STATUSES: return None, (jsonify({'error': 'Invalid status'}), 400)
+    limit = min(max(request.args.get('limit', 50, type=int), 1), app.config['TASK_PAGE_MAX_SIZE'])
+    after = None
+    if request.args.get('after'):
+        try:
+            after = decode_task_cursor(request.args['after'])
+        except ValueError:
+            return None, (jsonify({'error': 'Invalid cursor'}), 400)
+    return (request.args.get('since', type=int), status, limit, after), None
+
+def column_where(project_id, status, after):
+    # Keyset condition for one page of a column, newest first.
+    if after is None: return "t.project_id = %s AND t.status = %s", (project_id, status)
+    return "t.project_id = %s AND t.status = %s AND (t.created_at < %s OR (t.created_at = %s AND t.id < %s))", (project_id, status, after[0], after[0], after[1])
+
+def column_page(status, version, total, tasks, limit):
+    tasks = list(tasks.values())
+    page = {'status': status, 'version': version}
+    if total is not None: page['total'] = total
+    page['next_cursor'] = encode_task_cursor(tasks[limit - 1]) if len(tasks) > limit else None
+    page['tasks'] = format_task_dates(tasks[:limit])
+    return page
+
+def group_tasks(tasks):
+    grouped_tasks = {'todo': [], 'inprogress': [], 'done': []}
+    for task in format_task_dates(list(tasks.values())): grouped_tasks[task['status']].append(task)
+    return grouped_tasks
+
+def task_list_reads(project_id):
+    args, error = task_list_args()
+    if error: return error
+    since, status, limit, after = args
+    if since is None:
+        # Full boards and column pages are served from the board cache when nothing changed since.
+        cached_version, body = cached_board_page(project_id)
+        if body is not None: return board_response(project_id, cached_version, body)
+    version = (yield "SELECT version FROM projects WHERE id = %s", (project_id,))[0]['version']
+    etag = cache_validator('b', project_id, version)
+    cached = not_modified(etag)
+    if cached: return cached
+    if since is not None and since <= version:
+        # Delta mode: only tasks touched after `since`, plus tombstones for deleted ones.
+        tasks = yield from task_reads("t.project_id = %s AND t.version > %s", (project_id, since))
+        deleted = [row['task_id'] for row in (yield "SELECT task_id FROM task_tombstones WHERE project_id = %s AND version > %s", (project_id, since))]
+        return with_validator(jsonify({'version': version, 'tasks': format_task_dates(list(tasks.values())), 'deleted': deleted}), etag)
+    if status is not None:
+        # Column mode: one keyset page of a single column, newest first; the first page also carries the column size.
+        total = None
+        if after is None: total = (yield "SELECT COUNT(*) AS total FROM tasks WHERE project_id = %s AND status = %s", (project_id, status))[0]['total']
+        tasks = yield from task_reads(*column_where(project_id, status, after), limit + 1)
+        body = app.json.dumps(column_page(status, version, total, tasks, limit))
+    else:
+        body = app.json.dumps(group_tasks((yield from task_reads("t.project_id = %s", (project_id,)))))
+    store_board_page(project_id, version, body)
+    return board_response(project_id, version, body)
+
 @app.route('/projects/<int:project_id>/tasks', methods=['GET'])
 @login_required
 @project_member_required
 def get_tasks(project_id):
-    connection = None
     try:
-        connection = get_db_connection()
-        cur = connection.cursor(dictionary=True)
-        query = "SELECT t.id, t.content, t.status, t.priority, t.due_date, t.created_at, t.assignee_id, u.name as assignee_name, COUNT(c.id) as comment_count FROM tasks t LEFT JOIN users u ON t.assignee_id = u.id LEFT JOIN comments c ON t.id = c.task_id WHERE t.project_id = %s GROUP BY t.id ORDER BY t.created_at DESC"
-        cur.execute(query, (project_id,))
-        tasks = {task['id']: task for task in cur.fetchall()}
-        if tasks:
-            task_ids = tuple(tasks.keys())
-            if len(task_ids) == 1:
-                subtask_query = "SELECT id, content, is_complete, task_id FROM subtasks WHERE task_id = %s"
-                cur.execute(subtask_query, (task_ids[0],))
-            else:
-                placeholders = ', '.join(['%s'] * len(task_ids))
-                subtask_query = f"SELECT id, content, is_complete, task_id FROM subtasks WHERE task_id IN ({placeholders})"
-                cur.execute(subtask_query, task_ids)
-            
-            subtasks = cur.fetchall()
-            for task in tasks.values():
-                task['subtasks'] = []
-                if task.get('due_date'): task['due_date'] = task['due_date'].strftime('%Y-%m-%d')
-                if task.get('created_at'): task['created_at'] = task['created_at'].strftime('%b %d, %Y')
-            for subtask in subtasks:
-                if subtask['task_id'] in tasks: tasks[subtask['task_id']]['subtasks'].append(subtask)
-        cur.close()
-        grouped_tasks = {'todo': [], 'inprogress': [], 'done': []}
-        for task in tasks.values(): grouped_tasks[task['status']].append(task)
-        return jsonify(grouped_tasks)
+        return run_reads(task_list_reads(project_id))
     except Exception as e:
         print(f"Error fetching tasks for project {project_id}: {e}", file=sys.stderr)
         return jsonify({'error': 'Could not fetch tasks'}), 500
-    finally:
-        if connection and connection.is_connected(): connection.close()
+
+def board_response(project_id, version, body):
+    etag = cache_validator('b', project_id, version)
+    cached = not_modified(etag)
+    if cached: return cached
+    response = with_validator(app.response_class(body, mimetype='application/json'), etag)
+    response.headers['X-Board-Version'] = str(version)
+    return response
 
 @app.route('/projects/<int:project_id>/tasks', methods=['POST'])
 @login_required
@@ -220,11 +543,14 @@ def add_task(project_id):
         content, priority, due_date, assignee_id = data.get('content'), data.get('priority', 'medium'), data.get('due_date') or None, data.get('assignee_id') or None
         if not content: return jsonify({'error': 'Task content is required'}), 400
         connection = get_db_connection()
+        version = bump_board_version(connection, project_id)
         cur = connection.cursor()
-        cur.execute("INSERT INTO tasks (content, project_id, priority, due_date, assignee_id) VALUES (%s, %s, %s, %s, %s)", (content, project_id, priority, due_date, assignee_id))
+        cur.execute("INSERT INTO tasks (content, project_id, priority, due_date, assignee_id, version) VALUES (%s, %s, %s, %s, %s, %s)", (content, project_id, priority, due_date, assignee_id, version))
+        record_created(connection, project_id, 1)
         connection.commit()
         new_task_id = cur.lastrowid
         cur.close()
+        notify_board_change(project_id, 'task.created', task_id=new_task_id, version=version)
         return jsonify({'status': 'success'}), 201
     except Exception as e:
         print(f"Error adding task to project {project_id}: {e}", file=sys.stderr)
@@ -242,11 +568,15 @@ def update_task_details(project_id, task_id):
         content, priority, due_date, assignee_id = data.get('content'), data.get('priority'), data.get('due_date') or None, data.get('assignee_id') or None
         if not all([content, priority]): return jsonify({'error': 'Missing required fields'}), 400
         connection = get_db_connection()
+        version = bump_board_version(connection, project_id)
         cur = connection.cursor()
-        cur.execute("UPDATE tasks SET content = %s, priority = %s, due_date = %s, assignee_id = %s WHERE id = %s AND project_id = %s", (content, priority, due_date, assignee_id, task_id, project_id))
+        cur.execute("UPDATE tasks SET content = %s, priority = %s, due_date = %s, assignee_id = %s, version = %s WHERE id = %s AND project_id = %s", (content, priority, due_date, assignee_id, version, task_id, project_id))
+        if cur.rowcount == 0:
+            connection.rollback()
+            return jsonify({'error': 'Task not found in this project'}), 404
         connection.commit()
         cur.close()
-        if cur.rowcount == 0: return jsonify({'error': 'Task not found in this project'}), 404
+        notify_board_change(project_id, 'task.updated', task_id=task_id, version=version)
         return jsonify({'success': True})
     except Exception as e:
         print(f"Error updating task {task_id}: {e}", file=sys.stderr)
@@ -262,13 +592,19 @@ def update_task_status(project_id, task_id):
     try:
         data = request.get_json()
         new_status = data.get('status')
-        if new_status not in ['todo', 'inprogress', 'done']: return jsonify({'error': 'Invalid status'}), 400
+        if new_status not in TASK_STATUSES: return jsonify({'error': 'Invalid status'}), 400
         connection = get_db_connection()
+        version = bump_board_version(connection, project_id)
+        record_status_changes(connection, project_id, [(task_id, new_status)])
         cur = connection.cursor()
-        cur.execute("UPDATE tasks SET status = %s WHERE id = %s AND project_id = %s", (new_status, task_id, project_id))
+        # The clock only restarts on a real change (and is set before status, since MySQL assigns left to right).
+        cur.execute("UPDATE tasks SET status_changed_at = IF(status <> %s, NOW(), status_changed_at), status = %s, version = %s WHERE id = %s AND project_id = %s", (new_status, new_status, version, task_id, project_id))
+        if cur.rowcount == 0:
+            connection.rollback()
+            return jsonify({'error': 'Task not found in this project'}), 404
         connection.commit()
         cur.close()
-        if cur.rowcount == 0: return jsonify({'error': 'Task not found in this project'}), 404
+        notify_board_change(project_id, 'task.moved', task_id=task_id, status=new_status, version=version)
         return jsonify({'success': True})
     except Exception as e:
         print(f"Error updating task status for task {task_id}: {e}", file=sys.stderr)
@@ -283,11 +619,16 @@ def delete_task(project_id, task_id):
     connection = None
     try:
         connection = get_db_connection()
+        version = bump_board_version(connection, project_id)
         cur = connection.cursor()
         cur.execute("DELETE FROM tasks WHERE id = %s AND project_id = %s", (task_id, project_id))
+        if cur.rowcount == 0:
+            connection.rollback()
+            return jsonify({'error': 'Task not found in this project'}), 404
+        cur.execute("INSERT INTO task_tombstones (project_id, task_id, version) VALUES (%s, %s, %s)", (project_id, task_id, version))
         connection.commit()
         cur.close()
-        if cur.rowcount == 0: return jsonify({'error': 'Task not found in this project'}), 404
+        notify_board_change(project_id, 'task.deleted', task_id=task_id, version=version)
         return jsonify({'success': True})
     except Exception as e:
         print(f"Error deleting task {task_id}: {e}", file=sys.stderr)
@@ -295,7 +636,103 @@ def delete_task(project_id, task_id):
     finally:
         if connection and connection.is_connected(): connection.close()
 
+BATCH_OPERATIONS = ('create', 'update', 'status', 'delete', 'subtask')
+
+def validate_batch_operation(op):
+    kind = op.get('op') if isinstance(op, dict) else None
+    if kind not in BATCH_OPERATIONS: return 'Unknown operation'
+    if kind == 'create' and not op.get('content'): return 'Task content is required'
+    # bool is an int subclass; true would otherwise pass as id 1.
+    if kind != 'create' and (not isinstance(op.get('id'), int) or isinstance(op['id'], bool)): return 'An integer id is required'
+    if kind == 'update' and not all([op.get('content'), op.get('priority')]): return 'Missing required fields'
+    if kind == 'status' and op.get('status') not in TASK_STATUSES: return 'Invalid status'
+    if kind == 'subtask' and not isinstance(op.get('is_complete'), bool): return 'is_complete must be a boolean'
+    return None
+
+@app.route('/projects/<int:project_id>/tasks/batch', methods=['POST'])
+@login_required
+@project_member_required
+def batch_tasks(project_id):
+    connection = None
+    try:
+        data = request.get_json() or {}
+        operations = data.get('operations')
+        if not isinstance(operations, list) or not operations: return jsonify({'error': 'A list of operations is required'}), 400
+        if len(operations) > app.config['BATCH_MAX_OPERATIONS']: return jsonify({'error': f"At most {app.config['BATCH_MAX_OPERATIONS']} operations per batch"}), 400
+        errors = [{'index': i, 'error': error} for i, error in enumerate(map(validate_batch_operation, operations)) if error]
+        if errors: return jsonify({'error': 'Invalid operations', 'details': errors}), 400
+
+        connection = get_db_connection()
+        version = bump_board_version(connection, project_id)
+        cur = connection.cursor()
+        # Resolve every referenced task and subtask up front; the version bump holds the board lock,
+        # so the answer cannot change before we commit.
+        task_ids = list({op['id'] for op in operations if op['op'] in ('update', 'status', 'delete')})
+        existing_tasks = set()
+        if task_ids:
+            cur.execute(f"SELECT id FROM tasks WHERE project_id = %s AND id IN ({in_clause(task_ids)})", (project_id, *task_ids))
+            existing_tasks = {row[0] for row in cur.fetchall()}
+        subtask_ids = list({op['id'] for op in operations if op['op'] == 'subtask'})
+        subtask_parents = {}
+        if subtask_ids:
+            cur.execute(f"SELECT s.id, s.task_id, s.is_complete FROM subtasks s JOIN tasks t ON s.task_id = t.id WHERE t.project_id = %s AND s.id IN ({in_clause(subtask_ids)})", (project_id, *subtask_ids))
+            subtask_rows = cur.fetchall()
+            subtask_parents = {row[0]: row[1] for row in subtask_rows}
+            subtask_states = {row[0]: bool(row[2]) for row in subtask_rows}
+
+        results = [None] * len(operations)
+        updates, moves, toggles, deletes = [], [], [], []
+        done_deltas = {}
+        touched = set()
+        for i, op in enumerate(operations):
+            kind = op['op']
+            if kind == 'create':
+                # Inserted one by one so every row reports its own id; still inside the one transaction.
+                cur.execute("INSERT INTO tasks (content, project_id, priority, due_date, assignee_id, version) VALUES (%s, %s, %s, %s, %s, %s)", (op['content'], project_id, op.get('priority', 'medium'), op.get('due_date') or None, op.get('assignee_id') or None, version))
+                results[i] = {'index': i, 'status': 'ok', 'id': cur.lastrowid}
+                touched.add(cur.lastrowid)
+                continue
+            found = op['id'] in (subtask_parents if kind == 'subtask' else existing_tasks)
+            results[i] = {'index': i, 'status': 'ok' if found else 'not_found', 'id': op['id']}
+            if not found: continue
+            if kind == 'update': updates.append((op['content'], op['priority'], op.get('due_date') or None, op.get('assignee_id') or None, version, op['id'], project_id))
+            elif kind == 'status': moves.append((op['status'], op['status'], version, op['id'], project_id))
+            elif kind == 'subtask':
+                parent = subtask_parents[op['id']]
+                done_deltas[parent] = done_deltas.get(parent, 0) + int(op['is_complete']) - int(subtask_states[op['id']])
+                if op['is_complete'] != subtask_states[op['id']]: toggles.append((op['is_complete'], op['id']))
+                subtask_states[op['id']] = op['is_complete']
+            else: deletes.append(op['id'])
+            touched.add(subtask_parents[op['id']] if kind == 'subtask' else op['id'])
+
+        if updates: cur.executemany("UPDATE tasks SET content = %s, priority = %s, due_date = %s, assignee_id = %s, version = %s WHERE id = %s AND project_id = %s", updates)
+        if moves:
+            record_status_changes(connection, project_id, [(task_id, status) for status, _, _, task_id, _ in moves])
+            cur.executemany("UPDATE tasks SET status_changed_at = IF(status <> %s, NOW(), status_changed_at), status = %s, version = %s WHERE id = %s AND project_id = %s", moves)
+        if toggles: cur.executemany("UPDATE subtasks SET is_complete = %s WHERE id = %s", toggles)
+        if done_deltas: cur.executemany("UPDATE tasks SET version = %s, subtask_done = subtask_done + %s WHERE id = %s AND project_id = %s", [(version, delta, task_id, project_id) for task_id, delta in done_deltas.items()])
+        # Deletes run last, so other operations on the same task in this batch are simply superseded.
+        deletes = list(dict.fromkeys(deletes))
+        if deletes:
+            cur.execute(f"DELETE FROM tasks WHERE project_id = %s AND id IN ({in_clause(deletes)})", (project_id, *deletes))
+            cur.executemany("INSERT INTO task_tombstones (project_id, task_id, version) VALUES (%s, %s, %s)", [(project_id, task_id, version) for task_id in deletes])
+        created = sum(1 for op in operations if op['op'] == 'create')
+        if created: record_created(connection, project_id, created)
+        connection.commit()
+        cur.close()
+        notify_board_change(project_id, 'tasks.batch', task_ids=sorted(touched), version=version)
+        return jsonify({'version': version, 'results': results})
+    except Exception as e:
+        print(f"Error applying task batch for project {project_id}: {e}", file=sys.stderr)
+        if connection and connection.is_connected(): connection.rollback()
+        return jsonify({'error': 'Could not apply batch'}), 500
+    finally:
+        if connection and connection.is_connected(): connection.close()
+
 # ## FIXED: Changed date format to escape % signs for SQL ##
+# The '%%' escapes the percent sign for the database query
+COMMENT_THREAD_QUERY = "SELECT c.id, c.content, DATE_FORMAT(c.created_at, '%%b %%d, %%Y %%H:%%i') as created_at, u.name as author FROM {table} c JOIN users u ON c.user_id = u.id WHERE c.task_id = %s ORDER BY c.created_at ASC"
+
 @app.route('/projects/<int:project_id>/tasks/<int:task_id>/comments', methods=['GET'])
 @login_required
 @project_member_required
@@ -304,12 +741,17 @@ def get_comments(project_id, task_id):
     try:
         connection = get_db_connection()
         cur = connection.cursor(dictionary=True)
-        # The '%%' escapes the percent sign for the database query
-        query = "SELECT c.id, c.content, DATE_FORMAT(c.created_at, '%%b %%d, %%Y %%H:%%i') as created_at, u.name as author FROM comments c JOIN users u ON c.user_id = u.id WHERE c.task_id = %s ORDER BY c.created_at ASC"
-        cur.execute(query, (task_id,))
+        # Comments change the version of their task, which makes it the validator for the thread.
+        cur.execute("SELECT version FROM tasks WHERE id = %s AND project_id = %s", (task_id, project_id))
+        task = cur.fetchone()
+        if not task: return jsonify({'error': 'Task not found in this project'}), 404
+        etag = cache_validator('c', task_id, task['version'])
+        cached = not_modified(etag)
+        if cached: return cached
+        cur.execute(COMMENT_THREAD_QUERY.format(table='comments'), (task_id,))
         comments = cur.fetchall()
         cur.close()
-        return jsonify(comments)
+        return with_validator(jsonify(comments), etag)
     except Exception as e:
         print(f"Error fetching comments: {e}", file=sys.stderr)
         return jsonify({'error': 'Could not fetch comments'}), 500
@@ -327,12 +769,17 @@ def add_comment(project_id, task_id):
         content = data.get('content')
         if not content: return jsonify({'error': 'Comment content is required'}), 400
         connection = get_db_connection()
+        version = bump_board_version(connection, project_id)
         cur = connection.cursor(dictionary=True)
+        if not touch_task(cur, project_id, task_id, version, comments=1):
+            connection.rollback()
+            return jsonify({'error': 'Task not found in this project'}), 404
         cur.execute("INSERT INTO comments (content, task_id, user_id) VALUES (%s, %s, %s)", (content, task_id, user_id))
         connection.commit()
         new_comment_id = cur.lastrowid
         cur.close()
-        new_comment = {'id': new_comment_id, 'content': content, 'author': session.get('user_name'), 'created_at': datetime.now().strftime('%b %d, %Y %H:%M')}
+        notify_board_change(project_id, 'comment.created', task_id=task_id, comment_id=new_comment_id, version=version)
+        new_comment = {'id': new_comment_id, 'content': content, 'author': current_user()['name'], 'created_at': datetime.now().strftime('%b %d, %Y %H:%M')}
         return jsonify(new_comment), 201
     except Exception as e:
         print(f"Error adding comment: {e}", file=sys.stderr)
@@ -350,13 +797,16 @@ def add_subtask(project_id):
         content, task_id = data.get('content'), data.get('task_id')
         if not all([content, task_id]): return jsonify({'error': 'Content and task ID are required'}), 400
         connection = get_db_connection()
+        version = bump_board_version(connection, project_id)
         cur = connection.cursor()
-        cur.execute("SELECT id FROM tasks WHERE id = %s AND project_id = %s", (task_id, project_id))
-        if cur.fetchone() is None: return jsonify({'error': 'Parent task not found in this project'}), 404
+        if not touch_task(cur, project_id, task_id, version, subtasks=1):
+            connection.rollback()
+            return jsonify({'error': 'Parent task not found in this project'}), 404
         cur.execute("INSERT INTO subtasks (content, task_id) VALUES (%s, %s)", (content, task_id))
         connection.commit()
         new_subtask_id = cur.lastrowid
         cur.close()
+        notify_board_change(project_id, 'subtask.created', task_id=task_id, subtask_id=new_subtask_id, version=version)
         return jsonify({'id': new_subtask_id, 'content': content, 'is_complete': False}), 201
     except Exception as e:
         print(f"Error adding subtask: {e}", file=sys.stderr)
@@ -371,14 +821,21 @@ def update_subtask(project_id, subtask_id):
     connection = None
     try:
         data = request.get_json()
-        is_complete = data.get('is_complete')
+        is_complete = bool(data.get('is_complete'))
         connection = get_db_connection()
+        version = bump_board_version(connection, project_id)
         cur = connection.cursor()
-        query = "UPDATE subtasks s JOIN tasks t ON s.task_id = t.id SET s.is_complete = %s WHERE s.id = %s AND t.project_id = %s"
-        cur.execute(query, (is_complete, subtask_id, project_id))
+        cur.execute("SELECT s.task_id, s.is_complete FROM subtasks s JOIN tasks t ON s.task_id = t.id WHERE s.id = %s AND t.project_id = %s", (subtask_id, project_id))
+        subtask = cur.fetchone()
+        if subtask is None:
+            connection.rollback()
+            return jsonify({'error': 'Subtask not found in this project'}), 404
+        done_delta = int(is_complete) - int(bool(subtask[1]))
+        if done_delta: cur.execute("UPDATE subtasks SET is_complete = %s WHERE id = %s", (is_complete, subtask_id))
+        touch_task(cur, project_id, subtask[0], version, subtasks_done=done_delta)
         connection.commit()
         cur.close()
-        if cur.rowcount == 0: return jsonify({'error': 'Subtask not found in this project'}), 404
+        notify_board_change(project_id, 'subtask.updated', task_id=subtask[0], subtask_id=subtask_id, version=version)
         return jsonify({'success': True})
     except Exception as e:
         print(f"Error updating subtask: {e}", file=sys.stderr)
@@ -386,14 +843,448 @@ def update_subtask(project_id, subtask_id):
     finally:
         if connection and connection.is_connected(): connection.close()
 
+SEARCH_WORD = re.compile(r"\w+")
+
+# One arm per searchable table, each a MATCH against its FULLTEXT index limited to the project's tasks.
+SEARCH_SOURCES = (
+    ('task', "SELECT 'task' AS type, t.id, t.id AS task_id, t.content, MATCH(t.content) AGAINST (%s IN BOOLEAN MODE) AS score FROM tasks t WHERE t.project_id = %s AND MATCH(t.content) AGAINST (%s IN BOOLEAN MODE)"),
+    ('subtask', "SELECT 'subtask' AS type, s.id, s.task_id, s.content, MATCH(s.content) AGAINST (%s IN BOOLEAN MODE) AS score FROM subtasks s JOIN tasks t ON t.id = s.task_id WHERE t.project_id = %s AND MATCH(s.content) AGAINST (%s IN BOOLEAN MODE)"),
+    ('comment', "SELECT 'comment' AS type, c.id, c.task_id, c.content, MATCH(c.content) AGAINST (%s IN BOOLEAN MODE) AS score FROM comments c JOIN tasks t ON t.id = c.task_id WHERE t.project_id = %s AND MATCH(c.content) AGAINST (%s IN BOOLEAN MODE)"),
+)
+
+def search_terms(text):
+    # Words the FULLTEXT indexes can answer; InnoDB doesn't index shorter ones, and operators are dropped.
+    words = [word for word in SEARCH_WORD.findall(text.lower()) if len(word) >= app.config['SEARCH_MIN_WORD_LENGTH']]
+    return list(dict.fromkeys(words))[:8]
+
+def search_query(project_id, terms, limit):
+    # Every word is required and matched as a prefix, so results follow search-as-you-type.
+    against = ' '.join(f"+{term}*" for term in terms)
+    arms = " UNION ALL ".join(f"SELECT * FROM ({sql} ORDER BY score DESC LIMIT %s) AS {name}_hits" for name, sql in SEARCH_SOURCES)
+    params = [value for _ in SEARCH_SOURCES for value in (against, project_id, against, limit)]
+    return f"{arms} ORDER BY score DESC, type DESC, id DESC LIMIT %s", (*params, limit)
+
+def search_snippet(text, terms, width=160):
+    # Escaped excerpt around the first match with every match wrapped in <mark>.
+    pattern = re.compile(r"\b(?:" + "|".join(map(re.escape, terms)) + r")\w*", re.IGNORECASE)
+    first = pattern.search(text)
+    start = max(0, (first.start() if first else 0) - width // 4)
+    end = min(len(text), start + width)
+    excerpt, html, position = text[start:end], [], 0
+    for match in pattern.finditer(excerpt):
+        html += [escape(excerpt[position:match.start()]), Markup('<mark>'), escape(match.group()), Markup('</mark>')]
+        position = match.end()
+    html.append(escape(excerpt[position:]))
+    return ('…' if start else '') + ''.join(html) + ('…' if end < len(text) else '')
+
+@app.route('/projects/<int:project_id>/search')
+@login_required
+@project_member_required
+def search_tasks(project_id):
+    connection = None
+    try:
+        terms = search_terms(request.args.get('q', ''))
+        limit = min(max(request.args.get('limit', 20, type=int), 1), app.config['SEARCH_PAGE_MAX_SIZE'])
+        offset = min(max(request.args.get('offset', 0, type=int), 0), app.config['SEARCH_MAX_RESULTS'])
+        if not terms: return jsonify({'hits': [], 'tasks': [], 'next_offset': None})
+        connection = get_db_connection()
+        cur = connection.cursor(dictionary=True)
+        cur.execute("SELECT version FROM projects WHERE id = %s", (project_id,))
+        etag = cache_validator('s', project_id, cur.fetchone()['version'])
+        cached = not_modified(etag)
+        if cached: return cached
+        cur.execute(*search_query(project_id, terms, offset + limit + 1))
+        rows = cur.fetchall()
+        hits = [{'type': row['type'], 'id': row['id'], 'task_id': row['task_id'], 'score': round(float(row['score']), 4),
+                 'snippet': search_snippet(row['content'], terms)} for row in rows[offset:offset + limit]]
+        # The matched tasks themselves, so a hit can be opened even if its column page isn't loaded.
+        task_ids = tuple(dict.fromkeys(hit['task_id'] for hit in hits))
+        tasks = load_tasks(cur, f"t.project_id = %s AND t.id IN ({in_clause(task_ids)})", (project_id, *task_ids)) if task_ids else {}
+        cur.close()
+        next_offset = offset + limit if len(rows) > offset + limit and offset + limit < app.config['SEARCH_MAX_RESULTS'] else None
+        return with_validator(jsonify({'hits': hits, 'tasks': format_task_dates(list(tasks.values())), 'next_offset': next_offset}), etag)
+    except Exception as e:
+        print(f"Error searching project {project_id}: {e}", file=sys.stderr)
+        return jsonify({'error': 'Could not search tasks'}), 500
+    finally:
+        if connection and connection.is_connected(): connection.close()
+
+def weekly_buckets(rows, since, today):
+    # Daily rollups summed into weeks starting on Monday; weeks without activity are reported with zeros.
+    first = since - timedelta(days=since.weekday())
+    weeks = [{'week': (first + timedelta(weeks=i)).isoformat(), 'created': 0, 'completed': 0, 'reopened': 0} for i in range((today - first).days // 7 + 1)]
+    for row in rows:
+        week = weeks[(row['day'] - first).days // 7]
+        for field in ('created', 'completed', 'reopened'): week[field] += row[field]
+    return weeks
+
+@app.route('/projects/<int:project_id>/stats')
+@login_required
+@project_member_required
+def project_stats(project_id):
+    # Bounded cost however old the board is: at most STATS_MAX_DAYS rollup rows, plus one aggregate over the open
+    # tasks (done ones are excluded and eventually archived).
+    connection = None
+    try:
+        days = min(max(request.args.get('days', app.config['STATS_DEFAULT_DAYS'], type=int), 1), app.config['STATS_MAX_DAYS'])
+        connection = get_db_connection()
+        cur = connection.cursor(dictionary=True)
+        # Days are the database's, which stamps the rollups.
+        cur.execute("SELECT version, CURDATE() AS today FROM projects WHERE id = %s", (project_id,))
+        project = cur.fetchone()
+        today = project['today']
+        since = today - timedelta(days=days - 1)
+        # Overdue counts change at midnight without a write, so the day is part of the validator.
+        etag = cache_validator('t', f"{project_id}-{today.isoformat()}", project['version'])
+        cached = not_modified(etag)
+        if cached: return cached
+        cur.execute("SELECT day, created, completed, reopened, cycle_seconds FROM project_daily_stats WHERE project_id = %s AND day BETWEEN %s AND %s ORDER BY day", (project_id, since, today))
+        rows = cur.fetchall()
+        cur.execute("SELECT t.assignee_id, u.name, t.status, COUNT(*) AS tasks, SUM(CASE WHEN t.due_date < %s THEN 1 ELSE 0 END) AS overdue FROM tasks t LEFT JOIN users u ON t.assignee_id = u.id WHERE t.project_id = %s AND t.status IN ('todo', 'inprogress') GROUP BY t.assignee_id, u.name, t.status", (today, project_id))
+        workload = {}
+        for row in cur.fetchall():
+            entry = workload.setdefault(row['assignee_id'], {'assignee_id': row['assignee_id'], 'name': row['name'], 'todo': 0, 'inprogress': 0, 'overdue': 0})
+            entry[row['status']] = row['tasks']
+            entry['overdue'] += int(row['overdue'] or 0)
+        cur.close()
+        completed = sum(row['completed'] for row in rows)
+        cycle_seconds = sum(int(row['cycle_seconds']) for row in rows)
+        workload = sorted(workload.values(), key=lambda entry: (entry['name'] is None, entry['name'] or ''))
+        return with_validator(jsonify({
+            'from': since.isoformat(), 'to': today.isoformat(),
+            'created': sum(row['created'] for row in rows), 'completed': completed, 'reopened': sum(row['reopened'] for row in rows),
+            'cycle_time_hours': round(cycle_seconds / completed / 3600, 1) if completed else None,
+            'throughput': weekly_buckets(rows, since, today),
+            'open': {status: sum(entry[status] for entry in workload) for status in ('todo', 'inprogress')},
+            'overdue': sum(entry['overdue'] for entry in workload),
+            'workload': workload,
+        }), etag)
+    except Exception as e:
+        print(f"Error fetching stats for project {project_id}: {e}", file=sys.stderr)
+        return jsonify({'error': 'Could not fetch project stats'}), 500
+    finally:
+        if connection and connection.is_connected(): connection.close()
+
+# --- Export, import and archive ---
+
+EXPORT_FORMAT = 1
+# Columns moved between the live and archive tables.
+TASK_COLUMNS = "id, content, project_id, status, priority, due_date, created_at, assignee_id, version, comment_count, subtask_total, subtask_done, status_changed_at"
+SUBTASK_COLUMNS = "id, content, is_complete, task_id"
+COMMENT_COLUMNS = "id, content, task_id, user_id, created_at"
+
+# Members first, then live and archived tasks, then everything that hangs off a task, so an import can follow along.
+EXPORT_QUERIES = [('member', "SELECT u.email, u.name, pm.role FROM project_members pm JOIN users u ON pm.user_id = u.id WHERE pm.project_id = %s ORDER BY u.id")]
+EXPORT_QUERIES += [('task', f"SELECT t.id, t.content, t.status, t.priority, t.due_date, t.created_at, t.status_changed_at, {'t.archived_at' if prefix else 'NULL'} AS archived_at, u.email AS assignee_email FROM {prefix}tasks t LEFT JOIN users u ON t.assignee_id = u.id WHERE t.project_id = %s ORDER BY t.id") for prefix in ('', 'archived_')]
+EXPORT_QUERIES += [('subtask', f"SELECT s.id, s.task_id, s.content, s.is_complete FROM {prefix}subtasks s JOIN {prefix}tasks t ON s.task_id = t.id WHERE t.project_id = %s ORDER BY s.id") for prefix in ('', 'archived_')]
+EXPORT_QUERIES += [('comment', f"SELECT c.id, c.task_id, c.content, c.created_at, u.email AS author_email FROM {prefix}comments c JOIN {prefix}tasks t ON c.task_id = t.id JOIN users u ON c.user_id = u.id WHERE t.project_id = %s ORDER BY c.id") for prefix in ('', 'archived_')]
+
+def export_line(kind, row):
+    return json.dumps({'type': kind, **row}, default=lambda value: value.isoformat()) + "\n"
+
+def export_lines(connection, project_id):
+    # The whole project as NDJSON. Each query is read through an unbuffered cursor EXPORT_FETCH_SIZE rows at a time,
+    # so memory stays flat however big the board is; they all run in one transaction and so see one snapshot.
+    fetch_size = app.config['EXPORT_FETCH_SIZE']
+    cur = connection.cursor(dictionary=True)
+    cur.execute("SELECT name, version FROM projects WHERE id = %s", (project_id,))
+    yield export_line('project', {'format': EXPORT_FORMAT, **cur.fetchall()[0], 'exported_at': datetime.now()})
+    rows = 0
+    for kind, query in EXPORT_QUERIES:
+        cur.execute(query, (project_id,))
+        while batch := cur.fetchmany(fetch_size):
+            rows += len(batch)
+            for row in batch: yield export_line(kind, row)
+    cur.close()
+    # Lets an import tell a complete export from a truncated download.
+    yield export_line('end', {'rows': rows})
+
+@app.route('/projects/<int:project_id>/export')
+@login_required
+@project_member_required
+def export_project(project_id):
+    connection = get_db_connection()
+
+    def stream():
+        try:
+            yield from export_lines(connection, project_id)
+        except Exception as e:
+            print(f"Error exporting project {project_id}: {e}", file=sys.stderr)
+
+    response = app.response_class(stream(), mimetype='application/x-ndjson', headers={'Content-Disposition': f'attachment; filename="project-{project_id}.ndjson"', 'Cache-Control': 'no-store'})
+    # The connection stays checked out until the last row is sent or the client goes away.
+    response.call_on_close(connection.close)
+    return response
+
+def import_rows(cur, rows, owner_id):
+    # Recreates an exported project owned by owner_id; returns (project_id, member ids, row counts). Users are matched
+    # by email, and only kept when they are members of the new project: other assignees are left out and other
+    # authors' comments go to the owner, so an export can't put words in the mouth of someone outside the board.
+    # Archived tasks come back as done tasks and return to the archive on the next archive-tasks run.
+    header = next(rows, None)
+    if not header or header.get('type') != 'project' or header.get('format') != EXPORT_FORMAT: raise ValueError('Not a project export')
+    cur.execute("INSERT INTO projects (name, owner_id) VALUES (%s, %s)", (header['name'], owner_id))
+    project_id = cur.lastrowid
+    cur.execute("INSERT INTO project_members (project_id, user_id, role) VALUES (%s, %s, 'owner')", (project_id, owner_id))
+    # Rollup days from the export are kept out of the future (another time zone, or a tampered file).
+    cur.execute("SELECT CURDATE() AS today")
+    today = cur.fetchone()[0]
+    user_ids, task_ids, members, daily = {}, {}, {owner_id}, {}
+    pending, batch_size = {'subtask': [], 'comment': []}, app.config['IMPORT_BATCH_SIZE']
+    counts = {'member': 0, 'task': 0, 'subtask': 0, 'comment': 0}
+
+    def find_user(email):
+        if email not in user_ids:
+            cur.execute("SELECT id FROM users WHERE email = %s", (email,))
+            user = cur.fetchone()
+            user_ids[email] = user[0] if user else None
+        return user_ids[email]
+
+    def flush(kind):
+        if not pending[kind]: return
+        if kind == 'subtask': cur.executemany("INSERT INTO subtasks (content, is_complete, task_id) VALUES (%s, %s, %s)", pending[kind])
+        else: cur.executemany("INSERT INTO comments (content, task_id, user_id, created_at) VALUES (%s, %s, %s, %s)", pending[kind])
+        pending[kind] = []
+
+    for row in rows:
+        kind = row.get('type')
+        if kind == 'end': break
+        if kind == 'member':
+            user_id = find_user(row['email'])
+            if user_id is None or user_id in members: continue
+            cur.execute("INSERT INTO project_members (project_id, user_id, role) VALUES (%s, %s, 'member')", (project_id, user_id))
+            members.add(user_id)
+        elif kind == 'task':
+            if not row.get('content') or row.get('status') not in TASK_STATUSES: raise ValueError(f"Invalid task {row.get('id')}")
+            assignee_id = find_user(row['assignee_email']) if row.get('assignee_email') else None
+            created_at = datetime.fromisoformat(row['created_at']) if row.get('created_at') else datetime.now()
+            changed_at = datetime.fromisoformat(row['status_changed_at']) if row.get('status_changed_at') else None
+            cur.execute("INSERT INTO tasks (content, project_id, status, priority, due_date, created_at, status_changed_at, assignee_id) VALUES (%s, %s, %s, %s, %s, %s, %s, %s)",
+                        (row['content'], project_id, row['status'], row.get('priority') or 'medium', row.get('due_date'), created_at, changed_at,
+                         assignee_id if assignee_id in members else None))
+            task_ids[row['id']] = cur.lastrowid
+            # Rebuild the daily rollups as [created, completed, cycle seconds]; the status log itself is not exported.
+            daily.setdefault(min(created_at.date(), today), [0, 0, 0])[0] += 1
+            if row['status'] == 'done' and changed_at:
+                day = daily.setdefault(min(changed_at.date(), today), [0, 0, 0])
+                day[1] += 1
+                day[2] += max(int((changed_at - created_at).total_seconds()), 0)
+        elif kind in pending:
+            task_id = task_ids.get(row.get('task_id'))
+            if task_id is None: raise ValueError(f"{kind.capitalize()} {row.get('id')} belongs to a task missing from the export")
+            if kind == 'subtask': pending[kind].append((row['content'], bool(row.get('is_complete')), task_id))
+            else:
+                author_id = find_user(row['author_email']) if row.get('author_email') else None
+                pending[kind].append((row['content'], task_id, author_id if author_id in members else owner_id, row.get('created_at') or datetime.now()))
+            if len(pending[kind]) >= batch_size: flush(kind)
+        else:
+            raise ValueError(f"Unknown row type '{kind}'")
+        counts[kind] += 1
+    else:
+        raise ValueError('The export is incomplete')
+    flush('subtask')
+    flush('comment')
+    cur.execute(RECOUNT_TASK_COUNTERS + " WHERE project_id = %s", (project_id,))
+    if daily: cur.executemany(UPDATE_DAILY_STATS, [(project_id, day, created, completed, 0, cycle) for day, (created, completed, cycle) in daily.items()])
+    return project_id, members, counts
+
+@app.route('/projects/import', methods=['POST'])
+@login_required
+def import_project():
+    connection = None
+    try:
+        if request.content_length is None: return jsonify({'error': 'Content-Length is required'}), 411
+        if request.content_length > app.config['IMPORT_MAX_BYTES']: return jsonify({'error': 'The export is too large to import'}), 413
+        user_id = session['user_id']
+        # Read line by line off the request body; the file is never held in memory as a whole.
+        rows = (json.loads(line) for line in request.stream if line.strip())
+        connection = get_db_connection()
+        cur = connection.cursor()
+        project_id, members, counts = import_rows(cur, rows, user_id)
+        connection.commit()
+        cur.close()
+        for member_id in members: invalidate_user_context(member_id)
+        return jsonify({'status': 'success', 'project_id': project_id, 'imported': counts}), 201
+    except (ValueError, KeyError) as e:
+        if connection and connection.is_connected(): connection.rollback()
+        return jsonify({'error': f"Invalid export: {e}"}), 400
+    except Exception as e:
+        print(f"Error importing project: {e}", file=sys.stderr)
+        return jsonify({'error': 'Could not import project'}), 500
+    finally:
+        if connection and connection.is_connected(): connection.close()
+
+def archive_project_tasks(connection, project_id, task_ids, cutoff):
+    # Moves the given tasks (and their subtasks and comments) to the archive tables in one transaction, if they
+    # are still done since before `cutoff` once the board is locked. Boards drop them like deleted tasks.
+    version = bump_board_version(connection, project_id)
+    cur = connection.cursor()
+    cur.execute(f"SELECT id FROM tasks WHERE project_id = %s AND status = 'done' AND status_changed_at < %s AND id IN ({in_clause(task_ids)}) FOR UPDATE", (project_id, cutoff, *task_ids))
+    task_ids = tuple(row[0] for row in cur.fetchall())
+    if not task_ids:
+        connection.rollback()
+        return 0
+    ids = in_clause(task_ids)
+    cur.execute(f"INSERT INTO archived_subtasks ({SUBTASK_COLUMNS}) SELECT {SUBTASK_COLUMNS} FROM subtasks WHERE task_id IN ({ids})", task_ids)
+    cur.execute(f"INSERT INTO archived_comments ({COMMENT_COLUMNS}) SELECT {COMMENT_COLUMNS} FROM comments WHERE task_id IN ({ids})", task_ids)
+    cur.execute(f"INSERT INTO archived_tasks ({TASK_COLUMNS}) SELECT {TASK_COLUMNS} FROM tasks WHERE id IN ({ids})", task_ids)
+    # Subtasks and comments go with their task (ON DELETE CASCADE).
+    cur.execute(f"DELETE FROM tasks WHERE id IN ({ids})", task_ids)
+    cur.executemany("INSERT INTO task_tombstones (project_id, task_id, version) VALUES (%s, %s, %s)", [(project_id, task_id, version) for task_id in task_ids])
+    connection.commit()
+    cur.close()
+    notify_board_change(project_id, 'tasks.archived', task_ids=list(task_ids), version=version)
+    return len(task_ids)
+
+def archive_done_tasks(cutoff, batch_size, project_id=None):
+    # Archives every task done since before `cutoff`, batch_size at a time; returns {project_id: tasks archived}.
+    archived = {}
+    connection = get_db_connection()
+    try:
+        cur = connection.cursor()
+        where, params = "status = 'done' AND status_changed_at < %s", (cutoff,)
+        if project_id is not None: where, params = where + " AND project_id = %s", (cutoff, project_id)
+        while True:
+            cur.execute(f"SELECT project_id, id FROM tasks WHERE {where} ORDER BY id LIMIT %s", (*params, batch_size))
+            batch = {}
+            for task_project_id, task_id in cur.fetchall(): batch.setdefault(task_project_id, []).append(task_id)
+            # Start each project's transaction afresh, so it reads what is committed now.
+            connection.rollback()
+            moved = 0
+            for task_project_id, task_ids in batch.items():
+                count = archive_project_tasks(connection, task_project_id, task_ids, cutoff)
+                if count: archived[task_project_id] = archived.get(task_project_id, 0) + count
+                moved += count
+            if not moved: return archived
+    finally:
+        connection.close()
+
+ARCHIVE_LIST_QUERY = "SELECT t.id, t.content, t.status, t.priority, t.due_date, t.created_at, t.archived_at, t.assignee_id, u.name as assignee_name, t.comment_count, t.subtask_total, t.subtask_done FROM archived_tasks t LEFT JOIN users u ON t.assignee_id = u.id WHERE {where} ORDER BY t.archived_at DESC, t.id DESC LIMIT %s"
+
+@app.route('/projects/<int:project_id>/archive')
+@login_required
+@project_member_required
+def get_archive(project_id):
+    connection = None
+    try:
+        limit = min(max(request.args.get('limit', 50, type=int), 1), app.config['TASK_PAGE_MAX_SIZE'])
+        where, params = "t.project_id = %s", (project_id,)
+        if request.args.get('after'):
+            try:
+                archived_at, task_id = decode_task_cursor(request.args['after'])
+            except ValueError:
+                return jsonify({'error': 'Invalid cursor'}), 400
+            where, params = where + " AND (t.archived_at < %s OR (t.archived_at = %s AND t.id < %s))", (project_id, archived_at, archived_at, task_id)
+        connection = get_db_connection()
+        cur = connection.cursor(dictionary=True)
+        # The archive only changes together with the board version.
+        cur.execute("SELECT version FROM projects WHERE id = %s", (project_id,))
+        etag = cache_validator('a', project_id, cur.fetchone()['version'])
+        cached = not_modified(etag)
+        if cached: return cached
+        cur.execute(ARCHIVE_LIST_QUERY.format(where=where), (*params, limit + 1))
+        tasks = {task['id']: task for task in cur.fetchall()}
+        if tasks:
+            cur.execute(f"SELECT id, content, is_complete, task_id FROM archived_subtasks WHERE task_id IN ({in_clause(tasks)})", tuple(tasks))
+            attach_task_details(tasks, cur.fetchall(), [])
+        cur.close()
+        tasks = list(tasks.values())
+        next_cursor = encode_task_cursor(tasks[limit - 1], 'archived_at') if len(tasks) > limit else None
+        tasks = format_task_dates(tasks[:limit])
+        for task in tasks: task['archived_at'] = task['archived_at'].strftime('%b %d, %Y')
+        return with_validator(jsonify({'tasks': tasks, 'next_cursor': next_cursor}), etag)
+    except Exception as e:
+        print(f"Error fetching archive for project {project_id}: {e}", file=sys.stderr)
+        return jsonify({'error': 'Could not fetch archived tasks'}), 500
+    finally:
+        if connection and connection.is_connected(): connection.close()
+
+@app.route('/projects/<int:project_id>/archive/<int:task_id>/comments')
+@login_required
+@project_member_required
+def get_archived_comments(project_id, task_id):
+    connection = None
+    try:
+        connection = get_db_connection()
+        cur = connection.cursor(dictionary=True)
+        cur.execute("SELECT id FROM archived_tasks WHERE id = %s AND project_id = %s", (task_id, project_id))
+        if not cur.fetchall(): return jsonify({'error': 'Archived task not found in this project'}), 404
+        cur.execute(COMMENT_THREAD_QUERY.format(table='archived_comments'), (task_id,))
+        comments = cur.fetchall()
+        cur.close()
+        return jsonify(comments)
+    except Exception as e:
+        print(f"Error fetching archived comments: {e}", file=sys.stderr)
+        return jsonify({'error': 'Could not fetch comments'}), 500
+    finally:
+        if connection and connection.is_connected(): connection.close()
+
+def sse_message(event):
+    event_id = f"id: {event['version']}\n" if event.get('version') else ""
+    return f"{event_id}event: {event['type']}\ndata: {json.dumps(event)}\n\n"
+
+SSE_HEADERS = {'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+
+@app.route('/projects/<int:project_id>/events')
+@login_required
+@project_member_required
+def board_events(project_id):
+    # Server-sent events stream. Give back the connection the membership check may have handed us,
+    # since this response stays open for as long as the board is.
+    connection = g.pop('db_connection', None)
+    if connection is not None and connection.is_connected(): connection.close()
+    heartbeat = app.config['EVENT_HEARTBEAT_SECONDS']
+    subscription = event_broker.subscribe(project_id)
+
+    def stream():
+        try:
+            yield "retry: 3000\n\n"
+            while True:
+                event = subscription.get(timeout=heartbeat)
+                yield sse_message(event) if event is not None else ": keepalive\n\n"
+        finally:
+            subscription.close()
+
+    return app.response_class(stream(), mimetype='text/event-stream', headers=SSE_HEADERS)
+
+def throttle_auth(email):
+    retry_after = max(ip_limiter.consume(request.remote_addr), email_limiter.consume(email.strip().lower()) if email else 0)
+    if not retry_after: return None
+    response = jsonify({'status': 'error', 'message': 'Too many attempts. Please try again later.'})
+    response.headers['Retry-After'] = str(retry_after)
+    return response, 429
+
+def hashing_busy():
+    response = jsonify({'status': 'error', 'message': 'The server is busy. Please try again in a moment.'})
+    response.headers['Retry-After'] = '1'
+    return response, 503
+
+def rehash_password(user_id, password):
+    # The configured bcrypt cost changed since this hash was made; best effort, the login goes ahead regardless.
+    connection = None
+    try:
+        hashed_password = password_hasher.hash(password)
+        connection = get_db_connection()
+        cur = connection.cursor()
+        cur.execute("UPDATE users SET password = %s WHERE id = %s", (hashed_password, user_id))
+        connection.commit()
+        cur.close()
+    except Exception as e:
+        print(f"Error rehashing password for user {user_id}: {e}", file=sys.stderr)
+    finally:
+        if connection and connection.is_connected(): connection.close()
+
 @app.route('/signup', methods=['POST'])
 def signup():
     connection = None
     try:
         data = request.get_json()
-        if not data or not data.get('name') or not data.get('email') or not data.get('password'): return jsonify({'status': 'error', 'message': 'Name, email, and password are required'}), 400
+        if not isinstance(data, dict) or not data.get('name') or not data.get('email') or not data.get('password'): return jsonify({'status': 'error', 'message': 'Name, email, and password are required'}), 400
         name, email, password = data.get('name'), data.get('email'), data.get('password')
-        hashed_password = bcrypt.generate_password_hash(password).decode('utf-8')
+        if not all(isinstance(value, str) for value in (name, email, password)): return jsonify({'status': 'error', 'message': 'Name, email, and password must be strings'}), 400
+        throttled = throttle_auth(email)
+        if throttled: return throttled
+        hashed_password = password_hasher.hash(password)
         timestamp = datetime.now()
         connection = get_db_connection()
         cur = connection.cursor()
@@ -401,6 +1292,8 @@ def signup():
         connection.commit()
         cur.close()
         return jsonify({'status': 'success', 'message': 'Thank you for signing up! You can now log in.'})
+    except HashingBusy:
+        return hashing_busy()
     except Exception as e:
         if '1062' in str(e): return jsonify({'status': 'error', 'message': 'This email address is already registered.'}), 400
         print(f"A database error occurred in signup: {e}", file=sys.stderr)
@@ -413,17 +1306,33 @@ def login():
     connection = None
     try:
         data = request.get_json()
+        if not isinstance(data, dict): return jsonify({'status': 'error', 'message': 'Email and password are required'}), 400
         email, password = data.get('email'), data.get('password')
+        if not all(isinstance(value, (str, type(None))) for value in (email, password)): return jsonify({'status': 'error', 'message': 'Email and password must be strings'}), 400
+        if not email or not password: return jsonify({'status': 'error', 'message': 'Invalid email or password.'}), 401
+        throttled = throttle_auth(email)
+        if throttled: return throttled
         connection = get_db_connection()
         cur = connection.cursor(dictionary=True)
-        cur.execute("SELECT * FROM users WHERE email = %s", (email,))
+        cur.execute("SELECT id, password FROM users WHERE email = %s", (email,))
         user = cur.fetchone()
         cur.close()
-        if user and bcrypt.check_password_hash(user['password'], password):
-            session['logged_in'], session['user_id'], session['user_name'] = True, user['id'], user['name']
+        # Don't hold a pool connection while the hash is being checked.
+        connection.close()
+        connection = None
+        if user and password_hasher.check(user['password'], password):
+            if password_hasher.needs_rehash(user['password']): rehash_password(user['id'], password)
+            session.clear()
+            session.regenerate()
+            session['logged_in'], session['user_id'] = True, user['id']
+            # Load the user's context once here; later requests read it from the cache.
+            invalidate_user_context(user['id'])
+            current_user()
             return jsonify({'status': 'success', 'message': 'Login successful!', 'redirect_url': url_for('projects')})
         else:
             return jsonify({'status': 'error', 'message': 'Invalid email or password.'}), 401
+    except HashingBusy:
+        return hashing_busy()
     except Exception as e:
         print(f"A database error occurred in login: {e}", file=sys.stderr)
         return jsonify({'status': 'error', 'message': 'A server error occurred. Please try again.'}), 500
@@ -436,6 +1345,73 @@ def logout():
     session.clear()
     return redirect(url_for('index'))
 
+@app.cli.command('reconcile-counters')
+def reconcile_counters():
+    """Recompute comment/subtask counters on every task and report how many had drifted."""
+    connection = get_db_connection()
+    cur = connection.cursor()
+    cur.execute(DRIFTED_TASKS)
+    drifted = {}
+    for project_id, task_id in cur.fetchall(): drifted.setdefault(project_id, []).append(task_id)
+    connection.rollback()
+    # Repaired tasks get a new board version like any other write, so ETags, cached boards and ?since= deltas
+    # pick up the corrected counts. One transaction per project; counts are taken again under its lock.
+    for project_id, task_ids in drifted.items():
+        version = bump_board_version(connection, project_id)
+        cur.execute(RECOUNT_TASK_COUNTERS + f", version = %s WHERE project_id = %s AND id IN ({in_clause(task_ids)})", (version, project_id, *task_ids))
+        connection.commit()
+        notify_board_change(project_id, 'tasks.batch', task_ids=task_ids, version=version)
+    cur.close()
+    connection.close()
+    print(f"--- Reconciled task counters: {sum(map(len, drifted.values()))} task(s) repaired in {len(drifted)} project(s). ---")
+
+@app.cli.command('archive-tasks')
+@click.option('--days', type=int, default=None, help="Archive tasks done for more than this many days (default: ARCHIVE_AFTER_DAYS).")
+@click.option('--project', 'project_id', type=int, default=None, help="Only archive tasks of this project.")
+def archive_tasks(days, project_id):
+    """Move tasks that have been done for a while, with their subtasks and comments, into the archive tables."""
+    days = app.config['ARCHIVE_AFTER_DAYS'] if days is None else days
+    archived = archive_done_tasks(datetime.now() - timedelta(days=days), app.config['ARCHIVE_BATCH_SIZE'], project_id)
+    print(f"--- Archived {sum(archived.values())} task(s) from {len(archived)} project(s). ---")
+
+@app.route('/metrics')
+@admin_required
+def metrics():
+    pool = db_pool.stats()
+    user_context = user_context_cache.stats()
+    board = board_cache_stats()
+    extra = [
+        ('db_pool_connections_in_use', 'gauge', 'Pool connections currently checked out.', pool['in_use']),
+        ('db_pool_connections_idle', 'gauge', 'Idle pool connections.', pool['idle']),
+        ('db_pool_checkouts_total', 'counter', 'Pool checkouts.', pool['checkouts']),
+        ('db_pool_waits_total', 'counter', 'Checkouts that had to wait for a free connection.', pool['waits']),
+        ('db_pool_wait_seconds_total', 'counter', 'Time spent waiting for a free connection.', pool['wait_seconds']),
+        ('db_pool_timeouts_total', 'counter', 'Checkouts that gave up waiting.', pool['timeouts']),
+        ('user_context_cache_hits_total', 'counter', 'User context cache hits.', user_context['hits']),
+        ('user_context_cache_misses_total', 'counter', 'User context cache misses.', user_context['misses']),
+        ('board_cache_hits_total', 'counter', 'Task lists served from the board cache.', board['hits']),
+        ('board_cache_misses_total', 'counter', 'Task list requests that had to query MySQL.', board['misses']),
+    ]
+    return app.response_class(request_metrics.render(extra), mimetype='text/plain; version=0.0.4')
+
+@app.route('/admin/stats')
+@admin_required
+def admin_stats():
+    return jsonify({'db_pool': db_pool.stats(), 'user_context_cache': user_context_cache.stats(), 'sessions': app.session_interface.store.stats(), 'board_cache': board_cache_stats(), 'events': event_broker.stats(),
+                    'password_hashing': password_hasher.stats(), 'auth_throttle': {'ip': ip_limiter.stats(), 'email': email_limiter.stats()}})
+
+@app.route('/admin/sessions/revoke', methods=['POST'])
+@admin_required
+def revoke_sessions():
+    # Logs out one user ({"user_id": n}) or everyone (empty body) immediately.
+    data = request.get_json(silent=True) or {}
+    user_id = data.get('user_id')
+    if user_id is not None and not isinstance(user_id, int): return jsonify({'error': 'user_id must be an integer'}), 400
+    app.session_interface.revoke(user_id)
+    if user_id is None: user_context_cache.clear()
+    else: invalidate_user_context(user_id)
+    return jsonify({'status': 'success', 'revoked': 'all' if user_id is None else user_id})
+
 if __name__ == '__main__':
     port = int(os.environ.get('PORT', 5000))
     app.run(host='0.0.0.0', port=port)
\ No newline at end of file
@@ -0,0 +1,246 @@
+import asyncio
+import re
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from io import BytesIO
+
+from flask import g, jsonify
+
+from app import app, SSE_HEADERS, database_busy, event_broker, membership_reads, request_metrics, sse_message, task_list_reads
+from db import PoolTimeout
+
+try:
+    import aiomysql
+except ImportError:
+    aiomysql = None
+
+# ASGI entry point, e.g. uvicorn asgi:application --workers 2. Routes run through the Flask app on a
+# thread pool as under gunicorn. With SERVER_MODE=async the board reads (GET /projects/<id>/tasks) and
+# the event stream (GET /projects/<id>/events) run on the event loop instead, with aiomysql, so open
+# dashboards no longer each hold a thread. They share sessions, caches, validators and the event broker
+# with the Flask routes, and give the same responses.
+
+ASYNC_MODE = app.config['SERVER_MODE'] == 'async'
+if ASYNC_MODE and aiomysql is None: raise RuntimeError("SERVER_MODE=async needs aiomysql (pip install -r requirements-async.txt)")
+if app.config['SERVER_MODE'] not in ('sync', 'async'): raise ValueError(f"Unknown SERVER_MODE '{app.config['SERVER_MODE']}'")
+
+wsgi_executor = ThreadPoolExecutor(max_workers=app.config['ASGI_THREADS'], thread_name_prefix='wsgi')
+
+# --- Flask routes on the thread pool ---
+
+def build_environ(scope, body):
+    environ = {
+        'REQUEST_METHOD': scope['method'],
+        'SCRIPT_NAME': scope.get('root_path', '').encode('utf8').decode('latin1'),
+        'PATH_INFO': scope['path'].encode('utf8').decode('latin1'),
+        'QUERY_STRING': scope['query_string'].decode('latin1'),
+        'SERVER_PROTOCOL': f"HTTP/{scope.get('http_version', '1.1')}",
+        'SERVER_NAME': scope['server'][0] if scope.get('server') else 'localhost',
+        'SERVER_PORT': str(scope['server'][1]) if scope.get('server') else '80',
+        'REMOTE_ADDR': scope['client'][0] if scope.get('client') else '',
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': scope.get('scheme', 'http'),
+        'wsgi.input': BytesIO(body),
+        'wsgi.input_terminated': True,
+        'wsgi.errors': sys.stderr,
+        'wsgi.multithread': True,
+        'wsgi.multiprocess': True,
+        'wsgi.run_once': False,
+    }
+    for name, value in scope.get('headers', []):
+        name = name.decode('latin1').upper().replace('-', '_')
+        if name not in ('CONTENT_TYPE', 'CONTENT_LENGTH'): name = f"HTTP_{name}"
+        value = value.decode('latin1')
+        environ[name] = f"{environ[name]},{value}" if name in environ else value
+    # The body has been read in full, chunked or not, so its length is known.
+    environ['CONTENT_LENGTH'] = str(len(body))
+    return environ
+
+async def read_body(receive):
+    body = bytearray()
+    while True:
+        message = await receive()
+        if message['type'] == 'http.disconnect': return None
+        body += message.get('body', b'')
+        if not message.get('more_body'): return bytes(body)
+
+async def call_wsgi(scope, receive, send):
+    body = await read_body(receive)
+    if body is None: return
+    loop = asyncio.get_running_loop()
+    messages = asyncio.Queue()
+    disconnected = threading.Event()
+
+    def start_response(status, headers, exc_info=None):
+        headers = [(name.lower().encode('latin1'), value.encode('latin1')) for name, value in headers]
+        loop.call_soon_threadsafe(messages.put_nowait, {'type': 'http.response.start', 'status': int(status.split(' ', 1)[0]), 'headers': headers})
+
+    def run():
+        # Chunks are handed to the loop as they are produced, so streamed responses stream.
+        try:
+            result = app(build_environ(scope, body), start_response)
+            try:
+                for chunk in result:
+                    if disconnected.is_set(): break
+                    if chunk: loop.call_soon_threadsafe(messages.put_nowait, {'type': 'http.response.body', 'body': chunk, 'more_body': True})
+            finally:
+                if hasattr(result, 'close'): result.close()
+        finally:
+            loop.call_soon_threadsafe(messages.put_nowait, None)
+
+    async def watch_disconnect():
+        while (await receive())['type'] != 'http.disconnect': pass
+        disconnected.set()
+
+    watcher = asyncio.create_task(watch_disconnect())
+    done = loop.run_in_executor(wsgi_executor, run)
+    try:
+        while (message := await messages.get()) is not None:
+            await send(message)
+        await send({'type': 'http.response.body', 'body': b''})
+    finally:
+        disconnected.set()
+        watcher.cancel()
+        await done
+
+# --- Native async routes ---
+
+_pool = None
+_pool_lock = asyncio.Lock()
+
+async def get_pool():
+    global _pool
+    async with _pool_lock:
+        if _pool is None:
+            _pool = await aiomysql.create_pool(host=app.config['MYSQL_HOST'], port=app.config['MYSQL_PORT'], user=app.config['MYSQL_USER'],
+                                               password=app.config['MYSQL_PASSWORD'], db=app.config['MYSQL_DB'], minsize=1,
+                                               maxsize=app.config['ASYNC_DB_POOL_SIZE'], pool_recycle=app.config['DB_POOL_RECYCLE'],
+                                               connect_timeout=app.config['DB_CONNECT_TIMEOUT'], autocommit=False)
+    return _pool
+
+@asynccontextmanager
+async def db_cursor():
+    pool = await get_pool()
+    try:
+        connection = await asyncio.wait_for(pool.acquire(), app.config['DB_POOL_TIMEOUT'])
+    except asyncio.TimeoutError:
+        raise PoolTimeout(f"No database connection available within {app.config['DB_POOL_TIMEOUT']}s")
+    try:
+        async with connection.cursor(aiomysql.DictCursor) as cur:
+            yield cur
+    finally:
+        try:
+            # End the read snapshot; aiomysql would close a connection handed back mid-transaction.
+            await connection.rollback()
+        finally:
+            pool.release(connection)
+
+async def fetch(cur, query, params=()):
+    started = time.perf_counter()
+    try:
+        await cur.execute(query, params)
+        return await cur.fetchall()
+    finally:
+        # Charged to the request like InstrumentedCursor does for the sync routes.
+        if 'db_queries' in g:
+            elapsed = time.perf_counter() - started
+            g.db_queries += 1
+            g.db_seconds += elapsed
+            if request_metrics.slow_request_ms: g.db_statements.append((elapsed, query))
+
+async def run_reads(reads):
+    # app.run_reads on the event loop: the same reads generators, answered through aiomysql.
+    try:
+        step = next(reads)
+    except StopIteration as done:
+        return done.value
+    async with db_cursor() as cur:
+        while True:
+            rows = await fetch(cur, *step)
+            try:
+                step = reads.send(rows)
+            except StopIteration as done:
+                return done.value
+
+async def get_tasks(project_id):
+    # Same modes and responses as app.get_tasks.
+    try:
+        return await run_reads(task_list_reads(project_id))
+    except PoolTimeout as e:
+        return database_busy(e)
+    except Exception as e:
+        print(f"Error fetching tasks for project {project_id}: {e}", file=sys.stderr)
+        return jsonify({'error': 'Could not fetch tasks'}), 500
+
+def response_start(response, streaming=False):
+    headers = [(name.lower().encode('latin1'), value.encode('latin1')) for name, value in response.headers.items()
+               if not (streaming and name.lower() == 'content-length')]
+    return {'type': 'http.response.start', 'status': response.status_code, 'headers': headers}
+
+async def tasks_route(scope, receive, send, project_id):
+    with app.request_context(build_environ(scope, b'')):
+        try:
+            response = app.preprocess_request() or await run_reads(membership_reads(project_id)) or await get_tasks(project_id)
+        except PoolTimeout as e:
+            response = database_busy(e)
+        response = app.process_response(app.make_response(response))
+    await send(response_start(response))
+    await send({'type': 'http.response.body', 'body': response.get_data()})
+
+async def events_route(scope, receive, send, project_id):
+    with app.request_context(build_environ(scope, b'')):
+        try:
+            denied = app.preprocess_request() or await run_reads(membership_reads(project_id))
+        except PoolTimeout as e:
+            denied = database_busy(e)
+        response = app.process_response(app.make_response(denied or app.response_class(mimetype='text/event-stream', headers=SSE_HEADERS)))
+    if denied:
+        await send(response_start(response))
+        await send({'type': 'http.response.body', 'body': response.get_data()})
+        return
+    heartbeat = app.config['EVENT_HEARTBEAT_SECONDS']
+    subscription = event_broker.subscribe_async(project_id)
+    disconnected = asyncio.Event()
+
+    async def watch_disconnect():
+        while (await receive())['type'] != 'http.disconnect': pass
+        disconnected.set()
+
+    watcher = asyncio.create_task(watch_disconnect())
+    try:
+        await send(response_start(response, streaming=True))
+        await send({'type': 'http.response.body', 'body': b"retry: 3000\n\n", 'more_body': True})
+        while not disconnected.is_set():
+            event = await subscription.get(timeout=heartbeat)
+            message = sse_message(event) if event is not None else ": keepalive\n\n"
+            await send({'type': 'http.response.body', 'body': message.encode(), 'more_body': True})
+    finally:
+        watcher.cancel()
+        subscription.close()
+
+NATIVE_ROUTES = [(re.compile(r'/projects/(\d+)/tasks'), tasks_route), (re.compile(r'/projects/(\d+)/events'), events_route)]
+
+async def lifespan(receive, send):
+    while True:
+        message = await receive()
+        if message['type'] == 'lifespan.startup':
+            await send({'type': 'lifespan.startup.complete'})
+        elif message['type'] == 'lifespan.shutdown':
+            if _pool is not None:
+                _pool.close()
+                await _pool.wait_closed()
+            wsgi_executor.shutdown(wait=False)
+            await send({'type': 'lifespan.shutdown.complete'})
+            return
+
+async def application(scope, receive, send):
+    if scope['type'] == 'lifespan': return await lifespan(receive, send)
+    if scope['type'] != 'http': return
+    if ASYNC_MODE and scope['method'] == 'GET':
+        for pattern, route in NATIVE_ROUTES:
+            match = pattern.fullmatch(scope['path'])
+            if match: return await route(scope, receive, send, int(match.group(1)))
+    await call_wsgi(scope, receive, send)
@@ -0,0 +1,220 @@
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+import re
+import sys
+
+import click
+from flask import current_app, request, send_from_directory, url_for
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+try:
+    import rjsmin
+except ImportError:
+    rjsmin = None
+try:
+    import rcssmin
+except ImportError:
+    rcssmin = None
+
+# Minified, fingerprinted copies of static/css and static/js are written to static/dist, with a manifest
+# mapping each source to its copy and gzip (and brotli, when installed) variants next to it. Templates link
+# them through asset_url(); the static route serves them with a long immutable Cache-Control, precompressed
+# when the client accepts it. Without a build asset_url() falls back to the plain files.
+
+SOURCE_DIRS = ('css', 'js')
+HASHED = re.compile(r'^dist/.+\.[0-9a-f]{10}\.\w+$')
+PRECOMPRESSED = (('br', '.br'), ('gzip', '.gz'))
+
+manifest = {}
+
+_CSS_STRING = r'"(?:\\.|[^"\\])*"|\'(?:\\.|[^\'\\])*\''
+_CSS_TOKENS = re.compile(rf'({_CSS_STRING})|/\*.*?\*/|\s+', re.DOTALL)
+
+def minify_css(source):
+    if rcssmin is not None: return rcssmin.cssmin(source)
+    # Strings are kept as they are; comments and whitespace runs become one space, which is then dropped
+    # around punctuation. Spaces inside calc() and between selectors stay.
+    css = _CSS_TOKENS.sub(lambda match: match.group(1) or ' ', source)
+    parts = re.split(rf'({_CSS_STRING})', css)
+    for i in range(0, len(parts), 2):
+        parts[i] = re.sub(r'\s*([{};,>])\s*', r'\1', parts[i]).replace(';}', '}')
+        parts[i] = re.sub(r':\s+', ':', parts[i])
+    return ''.join(parts).strip()
+
+_JS_KEYWORDS_BEFORE_REGEX = {'return', 'typeof', 'case', 'do', 'else', 'in', 'of', 'new', 'delete', 'void', 'throw', 'instanceof', 'yield', 'await'}
+
+def _regex_allowed(last):
+    # Whether a '/' after the token `last` starts a regex literal rather than dividing.
+    if not last: return True
+    if last[0] in '\'"`/' and len(last) > 1: return False
+    if last[0].isalnum() or last[0] in '_$': return last in _JS_KEYWORDS_BEFORE_REGEX
+    return last in '(,=:[!&|?{};+-*%<>~^'
+
+def _skip_quoted(source, i):
+    # Index just past the string literal starting at i.
+    quote, i = source[i], i + 1
+    while i < len(source) and source[i] != quote: i += 2 if source[i] == '\\' else 1
+    return i + 1
+
+def _skip_template(source, i):
+    # Index just past the template literal starting at i, nested ${...} expressions and templates included.
+    i += 1
+    while i < len(source) and source[i] != '`':
+        if source[i] == '\\':
+            i += 2
+        elif source.startswith('${', i):
+            i, depth = i + 2, 1
+            while i < len(source) and depth:
+                char = source[i]
+                if char in '\'"': i = _skip_quoted(source, i)
+                elif char == '`': i = _skip_template(source, i)
+                else:
+                    depth += {'{': 1, '}': -1}.get(char, 0)
+                    i += 1
+        else:
+            i += 1
+    return i + 1
+
+def _skip_regex(source, i):
+    # Index just past the regex literal starting at i (flags included), or None if this '/' can't start one.
+    j, in_class = i + 1, False
+    while j < len(source):
+        char = source[j]
+        if char == '\n': return None
+        if char == '\\': j += 1
+        elif char == '[': in_class = True
+        elif char == ']': in_class = False
+        elif char == '/' and not in_class: break
+        j += 1
+    else:
+        return None
+    j += 1
+    while j < len(source) and (source[j].isalnum() or source[j] == '_'): j += 1
+    return j
+
+def minify_js(source):
+    if rjsmin is not None: return rjsmin.jsmin(source)
+    # Drops comments, indentation and blank lines but never joins two lines, so automatic semicolon insertion
+    # sees the same program. String, template and regex literals are copied untouched.
+    out, i, n, last, line_start = [], 0, len(source), '', True
+    while i < n:
+        char = source[i]
+        if char.isspace() or source.startswith('/*', i) or source.startswith('//', i):
+            j, newline = i, False
+            while j < n:
+                if source[j].isspace():
+                    newline = newline or source[j] == '\n'
+                    j += 1
+                elif source.startswith('//', j):
+                    end = source.find('\n', j)
+                    j = n if end < 0 else end
+                elif source.startswith('/*', j):
+                    end = source.find('*/', j + 2)
+                    newline = newline or '\n' in source[j:end]
+                    j = n if end < 0 else end + 2
+                else:
+                    break
+            if not line_start and j < n: out.append('\n' if newline else ' ')
+            line_start = line_start or newline
+            i = j
+            continue
+        if char in '\'"': end = _skip_quoted(source, i)
+        elif char == '`': end = _skip_template(source, i)
+        elif char == '/' and _regex_allowed(last):
+            end = _skip_regex(source, i) or i + 1
+        else:
+            end = i + 1
+            while end < n and (source[end].isalnum() or source[end] in '_$') and (char.isalnum() or char in '_$'): end += 1
+        last, line_start, i = source[i:end], False, end
+        out.append(last)
+    return ''.join(out).strip() + '\n'
+
+MINIFIERS = {'.css': minify_css, '.js': minify_js}
+
+def _write(path, data):
+    # Written aside and moved into place, so workers building at the same time never serve a partial file.
+    temp = f"{path}.{os.getpid()}.tmp"
+    with open(temp, 'wb') as f: f.write(data)
+    os.replace(temp, path)
+
+def _sources(static_folder):
+    for directory in SOURCE_DIRS:
+        for root, _, names in os.walk(os.path.join(static_folder, directory)):
+            for name in sorted(names):
+                if os.path.splitext(name)[1] in MINIFIERS: yield os.path.relpath(os.path.join(root, name), static_folder).replace(os.sep, '/')
+
+def build(static_folder, clean=False):
+    # Returns the new manifest. Copies from earlier builds stay for pages rendered before a deploy unless clean is set.
+    built = {}
+    for source in _sources(static_folder):
+        stem, ext = os.path.splitext(source)
+        with open(os.path.join(static_folder, source), encoding='utf-8') as f: data = MINIFIERS[ext](f.read()).encode()
+        target = f"dist/{stem}.{hashlib.sha256(data).hexdigest()[:10]}{ext}"
+        path = os.path.join(static_folder, target)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            _write(path + '.gz', gzip.compress(data, compresslevel=9, mtime=0))
+            if brotli is not None: _write(path + '.br', brotli.compress(data, quality=11))
+            _write(path, data)
+        built[source] = target
+    dist = os.path.join(static_folder, 'dist')
+    os.makedirs(dist, exist_ok=True)
+    _write(os.path.join(dist, 'manifest.json'), json.dumps(built, indent=2, sort_keys=True).encode())
+    if clean:
+        keep = {os.path.join(static_folder, target) + suffix for target in built.values() for suffix in ('', '.gz', '.br')}
+        for root, _, names in os.walk(dist):
+            for name in names:
+                path = os.path.join(root, name)
+                if name != 'manifest.json' and path not in keep: os.remove(path)
+    manifest.clear()
+    manifest.update(built)
+    return built
+
+def _stale(static_folder, manifest_path):
+    if not os.path.exists(manifest_path): return True
+    built_at = os.path.getmtime(manifest_path)
+    return any(os.path.getmtime(os.path.join(static_folder, source)) > built_at for source in _sources(static_folder))
+
+def asset_url(filename):
+    return url_for('static', filename=manifest.get(filename, filename))
+
+def serve_static(filename):
+    # Replaces Flask's static view: fingerprinted files never change, so browsers may keep them for good.
+    static_folder = current_app.static_folder
+    if not HASHED.match(filename): return current_app.send_static_file(filename)
+    max_age = current_app.config['ASSETS_MAX_AGE']
+    for encoding, suffix in PRECOMPRESSED:
+        if request.accept_encodings[encoding] and os.path.isfile(os.path.join(static_folder, filename + suffix)):
+            response = send_from_directory(static_folder, filename + suffix, mimetype=mimetypes.guess_type(filename)[0], max_age=max_age)
+            response.headers['Content-Encoding'] = encoding
+            break
+    else:
+        response = send_from_directory(static_folder, filename, max_age=max_age)
+    response.vary.add('Accept-Encoding')
+    response.headers['Cache-Control'] = f"public, max-age={max_age}, immutable"
+    return response
+
+def init_app(app):
+    manifest_path = os.path.join(app.static_folder, 'dist', 'manifest.json')
+    mode = app.config['ASSETS_BUILD']
+    if mode not in ('auto', 'never'): raise ValueError(f"Unknown ASSETS_BUILD '{mode}'")
+    try:
+        if mode == 'auto' and _stale(app.static_folder, manifest_path): build(app.static_folder)
+        with open(manifest_path) as f: manifest.update(json.load(f))
+    except OSError as e:
+        print(f"Static assets not built, serving the plain files: {e}", file=sys.stderr)
+    app.add_template_global(asset_url)
+    app.view_functions['static'] = serve_static
+
+    @app.cli.command('build-assets')
+    @click.option('--clean', is_flag=True, help="Also remove the files of earlier builds.")
+    def build_assets(clean):
+        """Minify and fingerprint static/css and static/js into static/dist."""
+        built = build(app.static_folder, clean=clean)
+        print(f"--- Built {len(built)} asset(s) into static/dist. ---")
@@ -0,0 +1,91 @@
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, TimeoutError
+
+import bcrypt
+
+# Password hashing runs on a small bounded pool so a burst of logins can't occupy every request
+# thread, and login/signup attempts are throttled per client IP and per email address.
+
+class HashingBusy(Exception):
+    pass
+
+def _hash_password(password, rounds):
+    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt(rounds)).decode('utf-8')
+
+def _check_password(hashed, password):
+    try:
+        return bcrypt.checkpw(password.encode('utf-8'), hashed.encode('utf-8'))
+    except ValueError:
+        return False
+
+class PasswordHasher:
+    def __init__(self, rounds=12, workers=2, queue_depth=8, timeout=10, executor='thread'):
+        self.rounds, self.timeout = rounds, timeout
+        pool_class = ProcessPoolExecutor if executor == 'process' else ThreadPoolExecutor
+        self._executor = pool_class(max_workers=workers)
+        # Running plus queued jobs; anything beyond is turned away instead of piling up.
+        self._slots = threading.BoundedSemaphore(workers + queue_depth)
+        self.completed = self.rejected = self.timed_out = 0
+
+    def _run(self, fn, *args):
+        if not self._slots.acquire(blocking=False):
+            self.rejected += 1
+            raise HashingBusy()
+        try:
+            future = self._executor.submit(fn, *args)
+        except BaseException:
+            self._slots.release()
+            raise
+        # The slot is held until the job is done (or cancelled), not merely until we stop waiting for it.
+        future.add_done_callback(lambda _: self._slots.release())
+        try:
+            result = future.result(timeout=self.timeout)
+        except TimeoutError:
+            future.cancel()
+            self.timed_out += 1
+            raise HashingBusy()
+        self.completed += 1
+        return result
+
+    def hash(self, password):
+        return self._run(_hash_password, password, self.rounds)
+
+    def check(self, hashed, password):
+        return bool(hashed) and self._run(_check_password, hashed, password)
+
+    def needs_rehash(self, hashed):
+        # bcrypt hashes look like $2b$<cost>$<salt+digest>
+        try:
+            return int(hashed.split('$')[2]) != self.rounds
+        except (IndexError, ValueError):
+            return True
+
+    def stats(self):
+        return {'rounds': self.rounds, 'completed': self.completed, 'rejected': self.rejected, 'timed_out': self.timed_out}
+
+class TokenBucketLimiter:
+    # `rate` tokens per minute refill each key's bucket up to `burst`. The least recently used keys
+    # are dropped past `maxsize`, which only ever forgives a client.
+    def __init__(self, rate, burst, maxsize=10000):
+        self.rate, self.burst, self.maxsize = rate / 60.0, burst, maxsize
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+        self.limited = 0
+
+    def consume(self, key):
+        # Returns 0 when allowed, otherwise the seconds until a token is available.
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.pop(key, (self.burst, now))
+            tokens = min(self.burst, tokens + (now - updated) * self.rate)
+            allowed = tokens >= 1
+            self._buckets[key] = (tokens - 1 if allowed else tokens, now)
+            while len(self._buckets) > self.maxsize: self._buckets.popitem(last=False)
+            if allowed: return 0
+            self.limited += 1
+            return max(1, int((1 - tokens) / self.rate) + 1)
+
+    def stats(self):
+        return {'tracked': len(self._buckets), 'limited': self.limited}
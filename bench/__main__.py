@@ -0,0 +1,251 @@
+import argparse
+import json
+import logging
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+from http.cookiejar import CookieJar
+from urllib.error import HTTPError
+from urllib.request import HTTPCookieProcessor, Request, build_opener
+
+# Benchmark for the board's hot routes. Seeds synthetic users/projects/tasks, then drives the real Flask
+# routes either in-process through the test client or over HTTP against a local threaded server, and
+# reports latency percentiles, throughput and database statements per request for each scenario.
+#
+#   python -m bench                              # SQLite stand-in, test client
+#   python -m bench --transport http --concurrency 16 --duration 30
+#   python -m bench --db mysql                   # the MySQL database from config.py (use a scratch one)
+
+# Every request comes from 127.0.0.1 with a handful of accounts; don't let the login throttle skew results.
+for name in ('AUTH_RATE_PER_IP', 'AUTH_BURST_PER_IP', 'AUTH_RATE_PER_EMAIL', 'AUTH_BURST_PER_EMAIL'):
+    os.environ.setdefault(name, '1000000')
+
+PASSWORD = 'bench-password'
+STATUSES = ('todo', 'inprogress', 'done')
+DEFAULT_MIX = 'board=35,column=20,move=20,comment=15,search=5,login=5'
+# Task, subtask and comment texts are drawn from these so searches have something to find.
+WORDS = ('deploy', 'review', 'design', 'refactor', 'migrate', 'document', 'billing', 'search', 'onboarding', 'dashboard',
+         'invoice', 'release', 'login', 'export', 'report', 'analytics', 'mobile', 'payments', 'settings', 'notifications')
+
+def parse_args():
+    parser = argparse.ArgumentParser(prog='python -m bench', description="Load test the task board routes.")
+    parser.add_argument('--db', choices=('sqlite', 'mysql'), default='sqlite', help="sqlite runs on a local file with no server; mysql uses config.py")
+    parser.add_argument('--sqlite-path', help="SQLite database file (default: a temporary file)")
+    parser.add_argument('--transport', choices=('client', 'http'), default='client', help="Flask test client or HTTP to a local threaded server")
+    parser.add_argument('--users', type=int, default=10)
+    parser.add_argument('--projects', type=int, default=2)
+    parser.add_argument('--tasks', type=int, default=300, help="tasks per project")
+    parser.add_argument('--subtasks', type=int, default=3, help="subtasks per task")
+    parser.add_argument('--comments', type=int, default=2, help="comments per task")
+    parser.add_argument('--concurrency', type=int, default=1)
+    parser.add_argument('--requests', type=int, default=1000, help="total requests to send")
+    parser.add_argument('--duration', type=float, help="run for this many seconds instead of a fixed request count")
+    parser.add_argument('--mix', default=DEFAULT_MIX, help=f"scenario weights (default: {DEFAULT_MIX})")
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--json', action='store_true', help="print the report as JSON")
+    args = parser.parse_args()
+    try:
+        args.mix = {scenario: int(weight) for scenario, weight in (part.split('=') for part in args.mix.split(','))}
+    except ValueError:
+        parser.error(f"--mix must look like {DEFAULT_MIX}")
+    unknown = set(args.mix) - set(SCENARIOS)
+    if unknown: parser.error(f"Unknown scenario(s): {', '.join(sorted(unknown))}")
+    return args
+
+# --- Data ---
+
+def seed(connection, password_hash, args, rng):
+    # Inserts the synthetic data directly; returns [(project_id, [task ids])] and the users' emails.
+    cur = connection.cursor()
+    run = int(time.time())
+    emails, user_ids = [], []
+    for i in range(args.users):
+        emails.append(f"bench-{run}-{i}@example.com")
+        cur.execute("INSERT INTO users (name, email, password) VALUES (%s, %s, %s)", (f"Bench User {i}", emails[-1], password_hash))
+        user_ids.append(cur.lastrowid)
+    projects = []
+    started = datetime.now() - timedelta(days=90)
+    for p in range(args.projects):
+        owner = user_ids[p % len(user_ids)]
+        cur.execute("INSERT INTO projects (name, owner_id, version) VALUES (%s, %s, %s)", (f"Bench Project {p}", owner, args.tasks))
+        project_id = cur.lastrowid
+        cur.executemany("INSERT INTO project_members (project_id, user_id, role) VALUES (%s, %s, %s)",
+                        [(project_id, user_id, 'owner' if user_id == owner else 'member') for user_id in user_ids])
+        task_ids, subtasks, comments = [], [], []
+        for t in range(args.tasks):
+            done = rng.randint(0, args.subtasks)
+            cur.execute("INSERT INTO tasks (content, project_id, status, priority, created_at, assignee_id, version, comment_count, subtask_total, subtask_done) "
+                        "VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)",
+                        (f"{' '.join(rng.sample(WORDS, 3)).capitalize()} #{t}", project_id, rng.choice(STATUSES), rng.choice(('low', 'medium', 'high')),
+                         started + timedelta(minutes=t * 5), rng.choice(user_ids), t + 1, args.comments, args.subtasks, done))
+            task_ids.append(cur.lastrowid)
+            subtasks += [(f"{rng.choice(WORDS).capitalize()} step {s}", s < done, task_ids[-1]) for s in range(args.subtasks)]
+            comments += [(f"Looks good, but check the {' and '.join(rng.sample(WORDS, 2))} parts", task_ids[-1], rng.choice(user_ids), started + timedelta(minutes=t * 5 + c)) for c in range(args.comments)]
+        cur.executemany("INSERT INTO subtasks (content, is_complete, task_id) VALUES (%s, %s, %s)", subtasks)
+        cur.executemany("INSERT INTO comments (content, task_id, user_id, created_at) VALUES (%s, %s, %s, %s)", comments)
+        projects.append((project_id, task_ids))
+    connection.commit()
+    cur.close()
+    return projects, emails
+
+# --- Clients ---
+
+class TestClient:
+    def __init__(self, app):
+        self._client = app.test_client()
+
+    def request(self, method, path, body=None):
+        response = self._client.open(path, method=method, json=body)
+        return response.status_code, int(response.headers.get('X-Bench-Queries', 0))
+
+class HTTPClient:
+    def __init__(self, base_url):
+        self._base_url = base_url
+        self._opener = build_opener(HTTPCookieProcessor(CookieJar()))
+
+    def request(self, method, path, body=None):
+        data = json.dumps(body).encode() if body is not None else None
+        request = Request(self._base_url + path, data=data, method=method, headers={'Content-Type': 'application/json'} if data else {})
+        try:
+            with self._opener.open(request) as response:
+                response.read()
+                return response.status, int(response.headers.get('X-Bench-Queries', 0))
+        except HTTPError as e:
+            e.read()
+            return e.code, int(e.headers.get('X-Bench-Queries', 0))
+
+# --- Scenarios ---
+
+def board(client, user, rng):
+    project_id, _ = rng.choice(user['projects'])
+    return client.request('GET', f"/projects/{project_id}/tasks")
+
+def column(client, user, rng):
+    project_id, _ = rng.choice(user['projects'])
+    return client.request('GET', f"/projects/{project_id}/tasks?status={rng.choice(STATUSES)}&limit=50")
+
+def move(client, user, rng):
+    project_id, task_ids = rng.choice(user['projects'])
+    return client.request('PUT', f"/projects/{project_id}/tasks/{rng.choice(task_ids)}/status", {'status': rng.choice(STATUSES)})
+
+def comment(client, user, rng):
+    project_id, task_ids = rng.choice(user['projects'])
+    return client.request('POST', f"/projects/{project_id}/tasks/{rng.choice(task_ids)}/comments", {'content': 'Benchmark comment'})
+
+def search(client, user, rng):
+    # What a user has typed so far of one or two words.
+    project_id, _ = rng.choice(user['projects'])
+    words = rng.sample(WORDS, rng.randint(1, 2))
+    words[-1] = words[-1][:rng.randint(3, len(words[-1]))]
+    return client.request('GET', f"/projects/{project_id}/search?q={'+'.join(words)}")
+
+def login(client, user, rng):
+    return client.request('POST', '/login', {'email': user['email'], 'password': PASSWORD})
+
+SCENARIOS = {'board': board, 'column': column, 'move': move, 'comment': comment, 'search': search, 'login': login}
+
+# --- Running and reporting ---
+
+def percentile(values, fraction):
+    # values must be sorted; nearest-rank percentile.
+    return values[min(len(values) - 1, max(0, int(round(fraction * len(values))) - 1))]
+
+class Recorder:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.samples = {}
+
+    def add(self, scenario, seconds, status, queries):
+        with self._lock: self.samples.setdefault(scenario, []).append((seconds, status, queries))
+
+    def report(self, elapsed):
+        rows, total = [], 0
+        for scenario, samples in sorted(self.samples.items()):
+            latencies = sorted(seconds * 1000 for seconds, _, _ in samples)
+            total += len(samples)
+            rows.append({'scenario': scenario, 'requests': len(samples), 'errors': sum(1 for _, status, _ in samples if status >= 400),
+                         'p50_ms': round(percentile(latencies, 0.50), 2), 'p95_ms': round(percentile(latencies, 0.95), 2),
+                         'p99_ms': round(percentile(latencies, 0.99), 2), 'queries_per_request': round(sum(q for _, _, q in samples) / len(samples), 2)})
+        return {'elapsed_seconds': round(elapsed, 3), 'requests': total, 'throughput_rps': round(total / elapsed, 1) if elapsed else None, 'scenarios': rows}
+
+def print_report(report, args):
+    print(f"\n{args.db} / {args.transport}, concurrency {args.concurrency}: {report['requests']} requests in {report['elapsed_seconds']}s "
+          f"({report['throughput_rps']} req/s)\n")
+    print(f"{'scenario':<10}{'requests':>10}{'errors':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'queries':>9}")
+    for row in report['scenarios']:
+        print(f"{row['scenario']:<10}{row['requests']:>10}{row['errors']:>8}{row['p50_ms']:>10}{row['p95_ms']:>10}{row['p99_ms']:>10}{row['queries_per_request']:>9}")
+
+def run_worker(number, make_client, users, args, recorder, tickets, deadline):
+    rng = random.Random(args.seed * 1000 + number)
+    user = users[number % len(users)]
+    client = make_client()
+    status, _ = client.request('POST', '/login', {'email': user['email'], 'password': PASSWORD})
+    if status != 200: raise RuntimeError(f"Benchmark user {user['email']} could not log in (HTTP {status})")
+    scenarios, weights = list(args.mix), list(args.mix.values())
+    def more():
+        if deadline: return time.monotonic() < deadline
+        return next(tickets, None) is not None
+    while more():
+        scenario = rng.choices(scenarios, weights)[0]
+        started = time.perf_counter()
+        status, queries = SCENARIOS[scenario](client, user, rng)
+        recorder.add(scenario, time.perf_counter() - started, status, queries)
+
+def main():
+    args = parse_args()
+    import app as board_app
+    from flask import g
+    from db import ConnectionPool
+    from werkzeug.serving import make_server
+
+    if args.db == 'sqlite':
+        from bench import sqlite_mysql
+        path = args.sqlite_path or os.path.join(tempfile.mkdtemp(prefix='board-bench-'), 'bench.sqlite3')
+        if not os.path.exists(path): sqlite_mysql.create_database(path)
+        config = board_app.app.config
+        board_app.db_pool = ConnectionPool(lambda: sqlite_mysql.connect(path), size=config['DB_POOL_SIZE'], max_overflow=config['DB_POOL_MAX_OVERFLOW'],
+                                           timeout=config['DB_POOL_TIMEOUT'], cursor_hook=board_app.request_metrics.instrument_cursor)
+        print(f"--- SQLite stand-in at {path} ---", file=sys.stderr)
+
+    @board_app.app.after_request
+    def expose_query_count(response):
+        response.headers['X-Bench-Queries'] = str(g.get('db_queries', 0))
+        return response
+
+    rng = random.Random(args.seed)
+    connection = board_app.db_pool.get_connection()
+    try:
+        projects, emails = seed(connection, board_app.password_hasher.hash(PASSWORD), args, rng)
+    finally:
+        connection.close()
+    users = [{'email': email, 'projects': projects} for email in emails]
+    print(f"--- Seeded {args.users} users, {args.projects} projects, {args.projects * args.tasks} tasks ---", file=sys.stderr)
+
+    server = None
+    if args.transport == 'http':
+        logging.getLogger('werkzeug').setLevel(logging.WARNING)
+        server = make_server('127.0.0.1', 0, board_app.app, threaded=True)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        base_url = f"http://127.0.0.1:{server.port}"
+        make_client = lambda: HTTPClient(base_url)
+    else:
+        make_client = lambda: TestClient(board_app.app)
+
+    recorder = Recorder()
+    tickets = iter(range(args.requests))
+    deadline = time.monotonic() + args.duration if args.duration else None
+    workers = [threading.Thread(target=run_worker, args=(n, make_client, users, args, recorder, tickets, deadline)) for n in range(args.concurrency)]
+    started = time.perf_counter()
+    for worker in workers: worker.start()
+    for worker in workers: worker.join()
+    report = recorder.report(time.perf_counter() - started)
+    if server: server.shutdown()
+    if args.json: print(json.dumps(report, indent=2))
+    else: print_report(report, args)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,55 @@
+-- SQLite version of the MySQL schema (base tables plus everything in migrations/) used by the benchmark.
+-- Keep it in step with new migrations.
+CREATE TABLE users (id INTEGER PRIMARY KEY AUTOINCREMENT, name TEXT NOT NULL, email TEXT NOT NULL UNIQUE, password TEXT NOT NULL, timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP);
+CREATE TABLE projects (id INTEGER PRIMARY KEY AUTOINCREMENT, name TEXT NOT NULL, owner_id INTEGER NOT NULL REFERENCES users(id), version INTEGER NOT NULL DEFAULT 0);
+CREATE TABLE project_members (project_id INTEGER NOT NULL REFERENCES projects(id) ON DELETE CASCADE, user_id INTEGER NOT NULL REFERENCES users(id), role TEXT NOT NULL DEFAULT 'member', PRIMARY KEY (project_id, user_id));
+CREATE TABLE tasks (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    content TEXT NOT NULL,
+    project_id INTEGER NOT NULL REFERENCES projects(id) ON DELETE CASCADE,
+    status TEXT NOT NULL DEFAULT 'todo',
+    priority TEXT NOT NULL DEFAULT 'medium',
+    due_date DATE,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    assignee_id INTEGER REFERENCES users(id),
+    version INTEGER NOT NULL DEFAULT 0,
+    comment_count INTEGER NOT NULL DEFAULT 0,
+    subtask_total INTEGER NOT NULL DEFAULT 0,
+    subtask_done INTEGER NOT NULL DEFAULT 0,
+    status_changed_at TIMESTAMP
+);
+CREATE TABLE subtasks (id INTEGER PRIMARY KEY AUTOINCREMENT, content TEXT NOT NULL, is_complete BOOLEAN NOT NULL DEFAULT 0, task_id INTEGER NOT NULL REFERENCES tasks(id) ON DELETE CASCADE);
+CREATE TABLE comments (id INTEGER PRIMARY KEY AUTOINCREMENT, content TEXT NOT NULL, task_id INTEGER NOT NULL REFERENCES tasks(id) ON DELETE CASCADE, user_id INTEGER NOT NULL REFERENCES users(id), created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP);
+CREATE TABLE archived_tasks (
+    id INTEGER PRIMARY KEY,
+    content TEXT NOT NULL,
+    project_id INTEGER NOT NULL,
+    status TEXT NOT NULL,
+    priority TEXT NOT NULL,
+    due_date DATE,
+    created_at TIMESTAMP,
+    assignee_id INTEGER,
+    version INTEGER NOT NULL DEFAULT 0,
+    comment_count INTEGER NOT NULL DEFAULT 0,
+    subtask_total INTEGER NOT NULL DEFAULT 0,
+    subtask_done INTEGER NOT NULL DEFAULT 0,
+    status_changed_at TIMESTAMP,
+    archived_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+CREATE TABLE archived_subtasks (id INTEGER PRIMARY KEY, content TEXT NOT NULL, is_complete BOOLEAN NOT NULL DEFAULT 0, task_id INTEGER NOT NULL);
+CREATE TABLE archived_comments (id INTEGER PRIMARY KEY, content TEXT NOT NULL, task_id INTEGER NOT NULL, user_id INTEGER NOT NULL, created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP);
+CREATE TABLE task_status_log (id INTEGER PRIMARY KEY AUTOINCREMENT, project_id INTEGER NOT NULL, task_id INTEGER NOT NULL, from_status TEXT NOT NULL, to_status TEXT NOT NULL, changed_at TIMESTAMP NOT NULL);
+CREATE TABLE project_daily_stats (project_id INTEGER NOT NULL, day DATE NOT NULL, created INTEGER NOT NULL DEFAULT 0, completed INTEGER NOT NULL DEFAULT 0, reopened INTEGER NOT NULL DEFAULT 0, cycle_seconds INTEGER NOT NULL DEFAULT 0, PRIMARY KEY (project_id, day));
+CREATE TABLE task_tombstones (project_id INTEGER NOT NULL, task_id INTEGER NOT NULL, version INTEGER NOT NULL, deleted_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP, PRIMARY KEY (project_id, version, task_id));
+
+CREATE INDEX idx_tasks_project_version ON tasks (project_id, version);
+CREATE INDEX idx_project_members_project_user ON project_members (project_id, user_id);
+CREATE INDEX idx_tasks_project_status_created ON tasks (project_id, status, created_at);
+CREATE INDEX idx_comments_task_created ON comments (task_id, created_at);
+CREATE INDEX idx_subtasks_task ON subtasks (task_id);
+CREATE INDEX idx_tasks_status_changed ON tasks (status, status_changed_at);
+CREATE INDEX idx_archived_tasks_project_archived ON archived_tasks (project_id, archived_at);
+CREATE INDEX idx_archived_subtasks_task ON archived_subtasks (task_id);
+CREATE INDEX idx_archived_comments_task_created ON archived_comments (task_id, created_at);
+CREATE INDEX idx_task_status_log_task ON task_status_log (task_id, to_status);
+CREATE INDEX idx_task_status_log_project ON task_status_log (project_id, changed_at);
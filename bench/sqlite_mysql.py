@@ -0,0 +1,146 @@
+import datetime
+import os
+import re
+import sqlite3
+
+# Just enough of mysql.connector's connection/cursor API on top of SQLite for app.py to run against a
+# local file with no MySQL server: %s placeholders, dictionary cursors, LAST_INSERT_ID(expr), the few
+# MySQL functions the routes use, ON DUPLICATE KEY UPDATE and boolean-mode MATCH ... AGAINST (by scanning,
+# without an index).
+# It is a benchmarking stand-in, not a general purpose driver.
+
+SCHEMA_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'schema.sql')
+
+sqlite3.register_adapter(datetime.datetime, lambda value: value.isoformat(' '))
+sqlite3.register_adapter(datetime.date, lambda value: value.isoformat())
+sqlite3.register_converter('TIMESTAMP', lambda raw: datetime.datetime.fromisoformat(raw.decode()))
+sqlite3.register_converter('DATE', lambda raw: datetime.date.fromisoformat(raw.decode()))
+
+# MySQL DATE_FORMAT specifiers that differ from strftime.
+_DATE_FORMAT_CODES = {'%i': '%M', '%M': '%B', '%s': '%S', '%h': '%I', '%W': '%A'}
+
+def _date_format(value, fmt):
+    if value is None: return None
+    if isinstance(value, str): value = datetime.datetime.fromisoformat(value)
+    return value.strftime(re.sub(r'%[a-zA-Z]', lambda m: _DATE_FORMAT_CODES.get(m.group(), m.group()), fmt))
+
+def _match_against(text, against):
+    # Score of a FULLTEXT boolean-mode search made of +word and +prefix* terms: matching words, 0 if any is missing.
+    words, score = re.findall(r'\w+', (text or '').lower()), 0
+    for term in against.lower().split():
+        word, prefix = term.strip('+*'), term.endswith('*')
+        found = sum(1 for w in words if (w.startswith(word) if prefix else w == word))
+        if not found and term.startswith('+'): return 0
+        score += found
+    return float(score)
+
+_MATCH_AGAINST = re.compile(r'MATCH\s*\(([\w.]+)\)\s*AGAINST\s*\(\s*\?\s+IN BOOLEAN MODE\s*\)', re.IGNORECASE)
+
+# NOW() AS x / CURDATE() AS x come back as datetime / date through sqlite3's column name types.
+_CLOCK_COLUMN = re.compile(r'\b(NOW|CURDATE)\(\)\s+AS\s+(\w+)', re.IGNORECASE)
+_CLOCK_TYPES = {'NOW': 'TIMESTAMP', 'CURDATE': 'DATE'}
+
+_ON_DUPLICATE_KEY = re.compile(r'\s+ON DUPLICATE KEY UPDATE\s+', re.IGNORECASE)
+_VALUES_REF = re.compile(r'VALUES\((\w+)\)', re.IGNORECASE)
+
+def _translate(operation):
+    operation = operation.replace('%%', '\0').replace('%s', '?').replace('\0', '%')
+    operation = _MATCH_AGAINST.sub(r'MATCH_AGAINST(\1, ?)', operation)
+    operation = _CLOCK_COLUMN.sub(lambda m: f'{m.group(1)}() AS "{m.group(2)} [{_CLOCK_TYPES[m.group(1).upper()]}]"', operation)
+    # ON DUPLICATE KEY UPDATE a = a + VALUES(a) becomes an upsert on whichever unique key conflicts.
+    parts = _ON_DUPLICATE_KEY.split(operation, 1)
+    if len(parts) == 2: operation = parts[0] + " ON CONFLICT DO UPDATE SET " + _VALUES_REF.sub(r'excluded.\1', parts[1])
+    return re.sub(r'\s+FOR UPDATE\b', '', operation)
+
+class Cursor:
+    def __init__(self, connection, dictionary=False):
+        self._cursor = connection._conn.cursor()
+        self._dictionary = dictionary
+
+    def execute(self, operation, params=()):
+        self._cursor.execute(_translate(operation), tuple(params or ()))
+
+    def executemany(self, operation, seq_params):
+        self._cursor.executemany(_translate(operation), [tuple(params) for params in seq_params])
+
+    def _row(self, row):
+        if row is None or not self._dictionary: return row
+        return {column[0]: value for column, value in zip(self._cursor.description, row)}
+
+    def fetchone(self):
+        return self._row(self._cursor.fetchone())
+
+    def fetchall(self):
+        return [self._row(row) for row in self._cursor.fetchall()]
+
+    def fetchmany(self, size=1):
+        return [self._row(row) for row in self._cursor.fetchmany(size)]
+
+    def __iter__(self):
+        return (self._row(row) for row in self._cursor)
+
+    @property
+    def lastrowid(self):
+        return self._cursor.lastrowid
+
+    @property
+    def rowcount(self):
+        return self._cursor.rowcount
+
+    @property
+    def description(self):
+        return self._cursor.description
+
+    def close(self):
+        self._cursor.close()
+
+class Connection:
+    def __init__(self, path, timeout=30):
+        self._conn = sqlite3.connect(path, timeout=timeout, detect_types=sqlite3.PARSE_DECLTYPES | sqlite3.PARSE_COLNAMES, check_same_thread=False)
+        self._conn.execute("PRAGMA foreign_keys = ON")
+        self._conn.execute("PRAGMA busy_timeout = %d" % (timeout * 1000))
+        self._last_insert_id = 0
+        self._conn.create_function('LAST_INSERT_ID', -1, self._last_insert_id_fn)
+        self._conn.create_function('DATE_FORMAT', 2, _date_format)
+        self._conn.create_function('MATCH_AGAINST', 2, _match_against)
+        self._conn.create_function('IF', 3, lambda condition, then, otherwise: then if condition else otherwise)
+        self._conn.create_function('NOW', 0, lambda: datetime.datetime.now().isoformat(' ', 'seconds'))
+        self._conn.create_function('CURDATE', 0, lambda: datetime.date.today().isoformat())
+        self._open = True
+
+    def _last_insert_id_fn(self, *args):
+        # LAST_INSERT_ID(expr) remembers expr for the next LAST_INSERT_ID() on this connection, like MySQL.
+        if args: self._last_insert_id = args[0]
+        return self._last_insert_id
+
+    def cursor(self, dictionary=False, **kwargs):
+        return Cursor(self, dictionary)
+
+    @property
+    def in_transaction(self):
+        return self._conn.in_transaction
+
+    def commit(self):
+        self._conn.commit()
+
+    def rollback(self):
+        self._conn.rollback()
+
+    def ping(self, reconnect=False, attempts=1, delay=0):
+        if not self._open: raise sqlite3.ProgrammingError("Connection is closed")
+
+    def is_connected(self):
+        return self._open
+
+    def close(self):
+        self._open = False
+        self._conn.close()
+
+def create_database(path):
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    with open(SCHEMA_PATH) as f: conn.executescript(f.read())
+    conn.close()
+
+def connect(path):
+    return Connection(path)
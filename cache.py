@@ -0,0 +1,202 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+# Small key/value caches shared by the request handlers. Every backend exposes the
+# same get/set/delete/clear/stats interface so callers never care where values live.
+
+_MISSING = object()
+
+class MemoryCache:
+    # Per-process LRU cache with a default TTL. Safe to share between worker threads.
+    def __init__(self, name, maxsize=1024, ttl=60):
+        self.name, self.maxsize, self.ttl = name, maxsize, ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.evictions = 0
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is not _MISSING and entry[1] > time.monotonic():
+                self._data.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            if entry is not _MISSING: del self._data[key]
+            self.misses += 1
+            return default
+
+    def peek(self, key, default=None):
+        # Like get(), but leaves the LRU order and the hit/miss counters alone.
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            return entry[0] if entry is not _MISSING and entry[1] > time.monotonic() else default
+
+    def set(self, key, value, ttl=None):
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key):
+        with self._lock: self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock: self._data.clear()
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {'backend': 'memory', 'size': len(self._data), 'maxsize': self.maxsize, 'hits': self.hits, 'misses': self.misses,
+                'evictions': self.evictions, 'hit_rate': round(self.hits / lookups, 4) if lookups else None}
+
+class SQLiteCache:
+    # Cache stored in a local SQLite file, so every worker process on the host sees the same
+    # entries (and the same invalidations). Values must be JSON serializable.
+    def __init__(self, name, path, maxsize=10000, ttl=60):
+        self.name, self.path, self.maxsize, self.ttl = name, path, maxsize, ttl
+        self._local = threading.local()
+        self.hits = self.misses = 0
+        self._writes = 0
+        with self._connection() as conn:
+            conn.execute("CREATE TABLE IF NOT EXISTS cache_entries (namespace TEXT NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL, expires_at REAL NOT NULL, PRIMARY KEY (namespace, key))")
+
+    def _connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key, default=None):
+        value = self.peek(key, _MISSING)
+        if value is not _MISSING:
+            self.hits += 1
+            return value
+        self.misses += 1
+        return default
+
+    def peek(self, key, default=None):
+        row = self._connection().execute("SELECT value, expires_at FROM cache_entries WHERE namespace = ? AND key = ?", (self.name, str(key))).fetchone()
+        return json.loads(row[0]) if row and row[1] > time.time() else default
+
+    def set(self, key, value, ttl=None):
+        expires_at = time.time() + (self.ttl if ttl is None else ttl)
+        conn = self._connection()
+        conn.execute("INSERT OR REPLACE INTO cache_entries (namespace, key, value, expires_at) VALUES (?, ?, ?, ?)", (self.name, str(key), json.dumps(value), expires_at))
+        self._writes += 1
+        if self._writes % 500 == 0: self._prune(conn)
+
+    def _prune(self, conn):
+        conn.execute("DELETE FROM cache_entries WHERE namespace = ? AND expires_at <= ?", (self.name, time.time()))
+        conn.execute("DELETE FROM cache_entries WHERE namespace = ? AND key IN (SELECT key FROM cache_entries WHERE namespace = ? ORDER BY expires_at DESC LIMIT -1 OFFSET ?)", (self.name, self.name, self.maxsize))
+
+    def delete(self, key):
+        self._connection().execute("DELETE FROM cache_entries WHERE namespace = ? AND key = ?", (self.name, str(key)))
+
+    def clear(self):
+        self._connection().execute("DELETE FROM cache_entries WHERE namespace = ?", (self.name,))
+
+    def stats(self):
+        size = self._connection().execute("SELECT COUNT(*) FROM cache_entries WHERE namespace = ? AND expires_at > ?", (self.name, time.time())).fetchone()[0]
+        lookups = self.hits + self.misses
+        return {'backend': 'sqlite', 'size': size, 'maxsize': self.maxsize, 'hits': self.hits, 'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else None}
+
+class FileCache:
+    # One JSON file per entry under a directory, so every worker process on the host sees the same
+    # entries without a database. Values must be JSON serializable. Files are spread over SHARDS
+    # subdirectories and carry their expiry as mtime, so a prune only stats the one shard it cleans.
+    SHARDS = 256
+
+    def __init__(self, name, path, maxsize=10000, ttl=60, prune_every=8):
+        self.name, self.maxsize, self.ttl, self.prune_every = name, maxsize, ttl, prune_every
+        self.path = os.path.join(path, name)
+        for shard in range(self.SHARDS): os.makedirs(os.path.join(self.path, f"{shard:02x}"), exist_ok=True)
+        self.hits = self.misses = 0
+        self._writes = 0
+
+    def _file(self, key):
+        digest = hashlib.sha256(str(key).encode()).hexdigest()
+        return os.path.join(self.path, digest[:2], digest)
+
+    def get(self, key, default=None):
+        value = self.peek(key, _MISSING)
+        if value is not _MISSING:
+            self.hits += 1
+            return value
+        self.misses += 1
+        return default
+
+    def peek(self, key, default=None):
+        try:
+            with open(self._file(key)) as f: entry = json.load(f)
+        except (OSError, ValueError):
+            return default
+        return entry['value'] if entry['expires_at'] > time.time() else default
+
+    def set(self, key, value, ttl=None):
+        expires_at = time.time() + (self.ttl if ttl is None else ttl)
+        path = self._file(key)
+        temp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temp, 'w') as f: json.dump({'value': value, 'expires_at': expires_at}, f)
+        os.utime(temp, (expires_at, expires_at))
+        # Readers see either the old file or the new one, never a partial write.
+        os.replace(temp, path)
+        self._writes += 1
+        # Keys hash evenly over the shards, so pruning the one just written to covers them all over time.
+        if self._writes % self.prune_every == 0: self._prune(os.path.dirname(path))
+
+    def _prune(self, shard):
+        now, entries = time.time(), []
+        for entry in os.scandir(shard):
+            if entry.name.endswith('.tmp'): continue
+            try:
+                expires_at = entry.stat().st_mtime
+            except OSError:
+                continue
+            if expires_at <= now: self._remove(entry.path)
+            else: entries.append((expires_at, entry.path))
+        # Each shard keeps its share of maxsize, the entries expiring last.
+        share = -(-self.maxsize // self.SHARDS)
+        for _, path in sorted(entries, reverse=True)[share:]: self._remove(path)
+
+    def _remove(self, path):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+    def _entries(self):
+        for shard in os.scandir(self.path):
+            if shard.is_dir(): yield from os.scandir(shard.path)
+
+    def delete(self, key):
+        self._remove(self._file(key))
+
+    def clear(self):
+        for entry in self._entries(): self._remove(entry.path)
+
+    def stats(self):
+        size = sum(1 for entry in self._entries() if not entry.name.endswith('.tmp'))
+        lookups = self.hits + self.misses
+        return {'backend': 'filesystem', 'size': size, 'maxsize': self.maxsize, 'hits': self.hits, 'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else None}
+
+def make_cache(config, name, maxsize, ttl, backend=None):
+    backend = backend or config.get('CACHE_BACKEND', 'memory')
+    instance = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'instance')
+    if backend == 'sqlite':
+        path = config.get('CACHE_SQLITE_PATH') or os.path.join(instance, 'cache.sqlite3')
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        return SQLiteCache(name, path, maxsize=maxsize, ttl=ttl)
+    if backend == 'filesystem': return FileCache(name, config.get('CACHE_FILE_DIR') or os.path.join(instance, 'cache'), maxsize=maxsize, ttl=ttl)
+    if backend != 'memory': raise ValueError(f"Unknown cache backend '{backend}'")
+    return MemoryCache(name, maxsize=maxsize, ttl=ttl)
@@ -0,0 +1,40 @@
+import gzip
+
+from flask import request
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Compresses large text responses (board payloads, pages) for clients that accept it. Brotli is used
+# when the optional `brotli` package is installed, gzip otherwise.
+
+COMPRESSIBLE_TYPES = ('application/json', 'text/html', 'text/css', 'text/plain', 'application/javascript', 'text/javascript')
+
+def accepted_encoding():
+    accepted = request.accept_encodings
+    if brotli is not None and accepted['br']: return 'br'
+    if accepted['gzip']: return 'gzip'
+    return None
+
+def compress(data, encoding, level=None):
+    if encoding == 'br': return brotli.compress(data, quality=level or 5)
+    return gzip.compress(data, compresslevel=level or 6)
+
+def init_app(app):
+    min_size = app.config['COMPRESS_MIN_SIZE']
+
+    @app.after_request
+    def compress_response(response):
+        if response.direct_passthrough or response.is_streamed or response.status_code != 200: return response
+        if response.mimetype not in COMPRESSIBLE_TYPES or 'Content-Encoding' in response.headers: return response
+        response.vary.add('Accept-Encoding')
+        encoding = accepted_encoding()
+        if encoding is None or response.calculate_content_length() < min_size: return response
+        response.set_data(compress(response.get_data(), encoding))
+        response.headers['Content-Encoding'] = encoding
+        # A compressed body is a different representation, so it gets its own strong validator.
+        etag, weak = response.get_etag()
+        if etag and not weak: response.set_etag(f"{etag}-{encoding}")
+        return response
@@ -1,11 +1,124 @@
 import os
 
 class Config:
-    # This key is used by Flask to securely sign the session cookie.
+    # Secret key used by Flask for signing.
     SECRET_KEY = os.environ.get('SECRET_KEY', b'\x8a\x0e\x1f\x9b\xec\xbf\x8e\x0c\x1a\xde\x9a\x8d\x1b\x9e\x1f\x8e')
 
     # Database configuration for production
     MYSQL_HOST = os.environ.get('MYSQL_HOST', 'localhost')
+    MYSQL_PORT = int(os.environ.get('MYSQL_PORT', 3306))
     MYSQL_USER = os.environ.get('MYSQL_USER', 'root')
     MYSQL_PASSWORD = os.environ.get('MYSQL_PASSWORD', 'Rishi@2006')
-    MYSQL_DB = os.environ.get('MYSQL_DB', 'saas_landing')
\ No newline at end of file
+    MYSQL_DB = os.environ.get('MYSQL_DB', 'saas_landing')
+
+    # Shared cache settings. 'memory' keeps entries per process; 'sqlite' shares them between
+    # all workers on the host through CACHE_SQLITE_PATH (defaults to instance/cache.sqlite3).
+    CACHE_BACKEND = os.environ.get('CACHE_BACKEND', 'memory')
+    CACHE_SQLITE_PATH = os.environ.get('CACHE_SQLITE_PATH')
+
+    # Per-user context (name, project memberships and roles) loaded at login and used by
+    # project_member_required. Membership changes invalidate it; the TTL bounds staleness between
+    # workers with the 'memory' backend.
+    USER_CONTEXT_TTL = int(os.environ.get('USER_CONTEXT_TTL', 300))
+    USER_CONTEXT_CACHE_SIZE = int(os.environ.get('USER_CONTEXT_CACHE_SIZE', 10000))
+
+    # Server-side sessions; the cookie only holds a random id. 'filesystem' (under CACHE_FILE_DIR, default
+    # instance/cache) and 'sqlite' are shared by all workers on the host, 'memory' suits a single process.
+    # A session ends after SESSION_LIFETIME seconds without a request and is written back at most once
+    # per SESSION_REFRESH_INTERVAL when unchanged.
+    SESSION_BACKEND = os.environ.get('SESSION_BACKEND', 'filesystem')
+    CACHE_FILE_DIR = os.environ.get('CACHE_FILE_DIR')
+    SESSION_LIFETIME = int(os.environ.get('SESSION_LIFETIME', 7 * 24 * 3600))
+    SESSION_REFRESH_INTERVAL = int(os.environ.get('SESSION_REFRESH_INTERVAL', 300))
+    SESSION_MAX_COUNT = int(os.environ.get('SESSION_MAX_COUNT', 100000))
+
+    # Token required (X-Admin-Token header or Authorization: Bearer) by /metrics and the /admin endpoints.
+    # They are disabled when unset.
+    ADMIN_TOKEN = os.environ.get('ADMIN_TOKEN')
+
+    # Board change events streamed from /projects/<id>/events. 'memory' only reaches clients connected
+    # to the same worker process; 'sqlite' relays events between all workers on the host.
+    EVENT_BROKER = os.environ.get('EVENT_BROKER', 'memory')
+    EVENT_SQLITE_PATH = os.environ.get('EVENT_SQLITE_PATH')
+    EVENT_HEARTBEAT_SECONDS = int(os.environ.get('EVENT_HEARTBEAT_SECONDS', 15))
+
+    # Upper bound on operations accepted by POST /projects/<id>/tasks/batch.
+    BATCH_MAX_OPERATIONS = int(os.environ.get('BATCH_MAX_OPERATIONS', 500))
+
+    # Largest page GET /projects/<id>/tasks?status=... will return.
+    TASK_PAGE_MAX_SIZE = int(os.environ.get('TASK_PAGE_MAX_SIZE', 200))
+
+    # Number of latest comments embedded in each task of the board payload for card previews.
+    COMMENT_PREVIEW_COUNT = int(os.environ.get('COMMENT_PREVIEW_COUNT', 2))
+
+    # bcrypt work factor; existing hashes with a different cost are rehashed on the next login.
+    BCRYPT_LOG_ROUNDS = int(os.environ.get('BCRYPT_LOG_ROUNDS', 12))
+    # Hashing runs on a bounded pool ('thread' or 'process'); requests beyond workers + queue depth get a 503.
+    AUTH_HASH_EXECUTOR = os.environ.get('AUTH_HASH_EXECUTOR', 'thread')
+    AUTH_HASH_WORKERS = int(os.environ.get('AUTH_HASH_WORKERS', 2))
+    AUTH_HASH_QUEUE_DEPTH = int(os.environ.get('AUTH_HASH_QUEUE_DEPTH', 8))
+    AUTH_HASH_TIMEOUT = int(os.environ.get('AUTH_HASH_TIMEOUT', 10))
+
+    # Login/signup attempts allowed per minute (and burst) for each client IP and each email address.
+    AUTH_RATE_PER_IP = int(os.environ.get('AUTH_RATE_PER_IP', 20))
+    AUTH_BURST_PER_IP = int(os.environ.get('AUTH_BURST_PER_IP', 20))
+    AUTH_RATE_PER_EMAIL = int(os.environ.get('AUTH_RATE_PER_EMAIL', 5))
+    AUTH_BURST_PER_EMAIL = int(os.environ.get('AUTH_BURST_PER_EMAIL', 5))
+
+    # Number of reverse proxies in front of the app (1 on Render) whose X-Forwarded-* headers are trusted.
+    TRUSTED_PROXY_COUNT = int(os.environ.get('TRUSTED_PROXY_COUNT', 0))
+
+    # Database connection pool. Up to DB_POOL_SIZE idle connections are kept; bursts may open DB_POOL_MAX_OVERFLOW more.
+    # When all are busy a request waits up to DB_POOL_TIMEOUT seconds before getting a 503.
+    DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', 5))
+    DB_POOL_MAX_OVERFLOW = int(os.environ.get('DB_POOL_MAX_OVERFLOW', 5))
+    DB_POOL_TIMEOUT = float(os.environ.get('DB_POOL_TIMEOUT', 5))
+    # Connections older than DB_POOL_RECYCLE seconds are replaced; ones idle for DB_POOL_PING_AFTER seconds are pinged first.
+    DB_POOL_RECYCLE = int(os.environ.get('DB_POOL_RECYCLE', 1800))
+    DB_POOL_PING_AFTER = float(os.environ.get('DB_POOL_PING_AFTER', 5))
+    DB_CONNECT_TIMEOUT = int(os.environ.get('DB_CONNECT_TIMEOUT', 10))
+    DB_CONNECT_RETRIES = int(os.environ.get('DB_CONNECT_RETRIES', 2))
+
+    # Requests slower than this many milliseconds are logged with the SQL they ran (0 disables the log).
+    SLOW_REQUEST_MS = int(os.environ.get('SLOW_REQUEST_MS', 0))
+
+    # Responses smaller than this many bytes are sent uncompressed.
+    COMPRESS_MIN_SIZE = int(os.environ.get('COMPRESS_MIN_SIZE', 1024))
+
+    # Rendered task lists are cached per project until the next board write (or the TTL, in seconds).
+    # With several worker processes use CACHE_BACKEND=sqlite so writes invalidate every worker's copy.
+    BOARD_CACHE_TTL = int(os.environ.get('BOARD_CACHE_TTL', 300))
+    BOARD_CACHE_SIZE = int(os.environ.get('BOARD_CACHE_SIZE', 1000))
+
+    # asgi.py: 'async' serves board reads and the event stream on the event loop with aiomysql; 'sync' runs every
+    # route on ASGI_THREADS threads like gunicorn would. ASYNC_DB_POOL_SIZE caps the aiomysql pool.
+    SERVER_MODE = os.environ.get('SERVER_MODE', 'sync')
+    ASGI_THREADS = int(os.environ.get('ASGI_THREADS', 16))
+    ASYNC_DB_POOL_SIZE = int(os.environ.get('ASYNC_DB_POOL_SIZE', 20))
+
+    # Board search: words shorter than SEARCH_MIN_WORD_LENGTH are ignored (match innodb_ft_min_token_size);
+    # results are paged SEARCH_PAGE_MAX_SIZE at a time, up to SEARCH_MAX_RESULTS deep.
+    SEARCH_MIN_WORD_LENGTH = int(os.environ.get('SEARCH_MIN_WORD_LENGTH', 3))
+    SEARCH_PAGE_MAX_SIZE = int(os.environ.get('SEARCH_PAGE_MAX_SIZE', 50))
+    SEARCH_MAX_RESULTS = int(os.environ.get('SEARCH_MAX_RESULTS', 500))
+
+    # Project export (NDJSON, streamed EXPORT_FETCH_SIZE rows at a time) and import (IMPORT_MAX_BYTES at most,
+    # written IMPORT_BATCH_SIZE rows per statement).
+    EXPORT_FETCH_SIZE = int(os.environ.get('EXPORT_FETCH_SIZE', 500))
+    IMPORT_BATCH_SIZE = int(os.environ.get('IMPORT_BATCH_SIZE', 500))
+    IMPORT_MAX_BYTES = int(os.environ.get('IMPORT_MAX_BYTES', 64 * 1024 * 1024))
+
+    # `flask --app app archive-tasks` moves tasks that have been done for ARCHIVE_AFTER_DAYS days into the
+    # archive tables, ARCHIVE_BATCH_SIZE tasks per transaction.
+    ARCHIVE_AFTER_DAYS = int(os.environ.get('ARCHIVE_AFTER_DAYS', 30))
+    ARCHIVE_BATCH_SIZE = int(os.environ.get('ARCHIVE_BATCH_SIZE', 500))
+
+    # /projects/<id>/stats reads the daily rollups of the last STATS_DEFAULT_DAYS days (?days= up to STATS_MAX_DAYS).
+    STATS_DEFAULT_DAYS = int(os.environ.get('STATS_DEFAULT_DAYS', 90))
+    STATS_MAX_DAYS = int(os.environ.get('STATS_MAX_DAYS', 365))
+
+    # Static assets are minified and fingerprinted into static/dist (`flask --app app build-assets`). 'auto' also
+    # rebuilds them at startup when a file in static/css or static/js is newer than the last build; 'never' only
+    # uses a prebuilt copy. Fingerprinted files are cached by browsers for ASSETS_MAX_AGE seconds.
+    ASSETS_BUILD = os.environ.get('ASSETS_BUILD', 'auto')
+    ASSETS_MAX_AGE = int(os.environ.get('ASSETS_MAX_AGE', 365 * 24 * 3600))
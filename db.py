@@ -0,0 +1,121 @@
+import threading
+import time
+from collections import deque
+
+# Connection pool used by get_db_connection(). Unlike mysql.connector's pool it opens connections
+# lazily, lets callers queue for a free connection instead of failing at once, pings connections that
+# sat idle, retires old ones and keeps counters for /admin/stats.
+
+class PoolTimeout(Exception):
+    pass
+
+class PooledConnection:
+    # Wraps a driver connection; close() hands it back to the pool instead of disconnecting.
+    def __init__(self, pool, cnx, created_at):
+        self._pool, self._cnx, self.created_at = pool, cnx, created_at
+
+    def __getattr__(self, name):
+        return getattr(self._cnx, name)
+
+    def is_connected(self):
+        return self._cnx is not None
+
+    def cursor(self, *args, **kwargs):
+        cursor = self._cnx.cursor(*args, **kwargs)
+        return self._pool.cursor_hook(cursor) if self._pool.cursor_hook else cursor
+
+    def close(self):
+        cnx, self._cnx = self._cnx, None
+        if cnx is not None: self._pool._release(cnx, self.created_at)
+
+class ConnectionPool:
+    def __init__(self, connect, size=5, max_overflow=5, timeout=5, recycle=1800, ping_after=5, connect_retries=2, retry_delay=0.5, cursor_hook=None):
+        self._connect, self.cursor_hook = connect, cursor_hook
+        self.size, self.max_overflow, self.timeout, self.recycle, self.ping_after = size, max_overflow, timeout, recycle, ping_after
+        self.connect_retries, self.retry_delay = connect_retries, retry_delay
+        self._idle = deque()  # (cnx, created_at, idle_since), most recently used last
+        self._total = 0
+        self._cond = threading.Condition()
+        self._metrics = {'checkouts': 0, 'timeouts': 0, 'waits': 0, 'wait_seconds': 0.0, 'max_wait_seconds': 0.0,
+                         'connections_opened': 0, 'connect_errors': 0, 'stale_discarded': 0, 'recycled': 0}
+
+    def _open(self):
+        # MySQL may not be up yet (e.g. right after boot); retry a few times before giving up.
+        for attempt in range(self.connect_retries + 1):
+            try:
+                cnx = self._connect()
+                with self._cond: self._metrics['connections_opened'] += 1
+                return cnx
+            except Exception:
+                with self._cond: self._metrics['connect_errors'] += 1
+                if attempt == self.connect_retries: raise
+                time.sleep(self.retry_delay * (attempt + 1))
+
+    def _discard(self, cnx):
+        try:
+            cnx.close()
+        except Exception:
+            pass
+
+    def get_connection(self):
+        started = time.monotonic()
+        waited = False
+        with self._cond:
+            while not self._idle and self._total >= self.size + self.max_overflow:
+                remaining = self.timeout - (time.monotonic() - started)
+                if remaining <= 0:
+                    self._metrics['timeouts'] += 1
+                    raise PoolTimeout(f"No database connection available within {self.timeout}s")
+                waited = True
+                self._cond.wait(remaining)
+            entry = self._idle.pop() if self._idle else None
+            if entry is None: self._total += 1
+            self._metrics['checkouts'] += 1
+            if waited:
+                wait = time.monotonic() - started
+                self._metrics['waits'] += 1
+                self._metrics['wait_seconds'] += wait
+                self._metrics['max_wait_seconds'] = max(self._metrics['max_wait_seconds'], wait)
+        try:
+            if entry is not None:
+                cnx, created_at, idle_since = entry
+                now = time.monotonic()
+                if now - created_at > self.recycle:
+                    self._discard(cnx)
+                    with self._cond: self._metrics['recycled'] += 1
+                    entry = None
+                elif now - idle_since >= self.ping_after:
+                    try:
+                        cnx.ping(reconnect=False)
+                    except Exception:
+                        self._discard(cnx)
+                        with self._cond: self._metrics['stale_discarded'] += 1
+                        entry = None
+            if entry is None:
+                cnx, created_at = self._open(), time.monotonic()
+            return PooledConnection(self, cnx, created_at)
+        except Exception:
+            with self._cond:
+                self._total -= 1
+                self._cond.notify()
+            raise
+
+    def _release(self, cnx, created_at):
+        try:
+            # End whatever transaction (or read snapshot) the borrower left open.
+            if getattr(cnx, 'in_transaction', True): cnx.rollback()
+        except Exception:
+            self._discard(cnx)
+            cnx = None
+        with self._cond:
+            if cnx is not None and len(self._idle) < self.size:
+                self._idle.append((cnx, created_at, time.monotonic()))
+            else:
+                self._total -= 1
+                if cnx is not None: self._discard(cnx)
+            self._cond.notify()
+
+    def stats(self):
+        with self._cond:
+            return {'size': self.size, 'max_overflow': self.max_overflow, 'open': self._total, 'idle': len(self._idle),
+                    'in_use': self._total - len(self._idle), **self._metrics}
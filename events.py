@@ -0,0 +1,178 @@
+import asyncio
+import json
+import os
+import queue
+import sqlite3
+import threading
+import time
+
+# Publish/subscribe of board change events, one channel per project. Brokers hand out
+# subscriptions with a blocking get(timeout) and close(); swap them with EVENT_BROKER.
+# subscribe_async() hands out the same for asyncio code (asgi.py), with get() awaited.
+
+RESYNC_EVENT = {'type': 'resync'}
+
+class _QueueSubscription:
+    def __init__(self, broker, channel, maxsize):
+        self._broker, self.channel = broker, channel
+        self._queue = queue.Queue(maxsize=maxsize)
+
+    def put(self, event):
+        try:
+            self._queue.put_nowait(event)
+        except queue.Full:
+            # A slow client lost events; drop the backlog and tell it to resync from its version.
+            with self._queue.mutex: self._queue.queue.clear()
+            self._queue.put_nowait(RESYNC_EVENT)
+
+    def get(self, timeout=None):
+        try:
+            return self._queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def close(self):
+        self._broker._unsubscribe(self)
+
+class _AsyncQueueSubscription:
+    # Delivery onto an event loop; publishers call put() from their request threads.
+    def __init__(self, broker, channel, maxsize, loop):
+        self._broker, self.channel, self._loop = broker, channel, loop
+        self._queue = asyncio.Queue(maxsize=maxsize)
+
+    def put(self, event):
+        try:
+            self._loop.call_soon_threadsafe(self._put, event)
+        except RuntimeError:
+            pass  # The loop is gone; the subscriber will never read again.
+
+    def _put(self, event):
+        try:
+            self._queue.put_nowait(event)
+        except asyncio.QueueFull:
+            while not self._queue.empty(): self._queue.get_nowait()
+            self._queue.put_nowait(RESYNC_EVENT)
+
+    async def get(self, timeout=None):
+        try:
+            return await asyncio.wait_for(self._queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def close(self):
+        self._broker._unsubscribe(self)
+
+class InProcessBroker:
+    # Delivers events to subscribers connected to this worker process only.
+    def __init__(self, max_queue=100):
+        self.max_queue = max_queue
+        self._subscribers = {}
+        self._lock = threading.Lock()
+        self.published = 0
+
+    def publish(self, channel, event):
+        with self._lock:
+            subscribers = list(self._subscribers.get(channel, ()))
+            self.published += 1
+        for subscription in subscribers: subscription.put(event)
+
+    def subscribe(self, channel):
+        return self._add(_QueueSubscription(self, channel, self.max_queue))
+
+    def subscribe_async(self, channel):
+        return self._add(_AsyncQueueSubscription(self, channel, self.max_queue, asyncio.get_running_loop()))
+
+    def _add(self, subscription):
+        with self._lock: self._subscribers.setdefault(subscription.channel, set()).add(subscription)
+        return subscription
+
+    def _unsubscribe(self, subscription):
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.channel)
+            if subscribers:
+                subscribers.discard(subscription)
+                if not subscribers: del self._subscribers[subscription.channel]
+
+    def stats(self):
+        with self._lock:
+            return {'backend': 'memory', 'published': self.published, 'channels': len(self._subscribers),
+                    'subscribers': sum(len(s) for s in self._subscribers.values())}
+
+class _PollingSubscription:
+    def __init__(self, broker, channel):
+        self._broker, self.channel = broker, channel
+        self._last_id = broker._last_id()
+        self._pending = []
+
+    def _poll(self):
+        if self._pending: return True
+        rows = self._broker._read(self.channel, self._last_id)
+        if rows:
+            self._last_id = rows[-1][0]
+            self._pending = [json.loads(payload) for _, payload in rows]
+        return bool(rows)
+
+    def get(self, timeout=None):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not self._poll():
+            if deadline is not None and time.monotonic() >= deadline: return None
+            time.sleep(self._broker.poll_interval)
+        return self._pending.pop(0)
+
+    def close(self):
+        pass
+
+class _AsyncPollingSubscription(_PollingSubscription):
+    async def get(self, timeout=None):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not self._poll():
+            if deadline is not None and time.monotonic() >= deadline: return None
+            await asyncio.sleep(self._broker.poll_interval)
+        return self._pending.pop(0)
+
+class SQLiteBroker:
+    # Events are appended to a local SQLite file and polled by subscribers, so every worker
+    # process on the host sees every event. Old rows are pruned after `retention` seconds.
+    def __init__(self, path, poll_interval=0.5, retention=3600):
+        self.path, self.poll_interval, self.retention = path, poll_interval, retention
+        self._local = threading.local()
+        self.published = 0
+        self._connection().execute("CREATE TABLE IF NOT EXISTS board_events (id INTEGER PRIMARY KEY AUTOINCREMENT, channel TEXT NOT NULL, payload TEXT NOT NULL, created_at REAL NOT NULL)")
+
+    def _connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def publish(self, channel, event):
+        conn = self._connection()
+        conn.execute("INSERT INTO board_events (channel, payload, created_at) VALUES (?, ?, ?)", (str(channel), json.dumps(event), time.time()))
+        self.published += 1
+        if self.published % 500 == 0: conn.execute("DELETE FROM board_events WHERE created_at < ?", (time.time() - self.retention,))
+
+    def subscribe(self, channel):
+        return _PollingSubscription(self, str(channel))
+
+    def subscribe_async(self, channel):
+        return _AsyncPollingSubscription(self, str(channel))
+
+    def _last_id(self):
+        return self._connection().execute("SELECT COALESCE(MAX(id), 0) FROM board_events").fetchone()[0]
+
+    def _read(self, channel, after_id):
+        return self._connection().execute("SELECT id, payload FROM board_events WHERE channel = ? AND id > ? ORDER BY id LIMIT 100", (channel, after_id)).fetchall()
+
+    def stats(self):
+        return {'backend': 'sqlite', 'published': self.published}
+
+def make_broker(config):
+    backend = config.get('EVENT_BROKER', 'memory')
+    if backend == 'sqlite':
+        path = config.get('EVENT_SQLITE_PATH') or os.path.join(os.path.dirname(os.path.abspath(__file__)), 'instance', 'events.sqlite3')
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        return SQLiteBroker(path)
+    if backend != 'memory': raise ValueError(f"Unknown EVENT_BROKER '{backend}'")
+    return InProcessBroker()
@@ -0,0 +1,130 @@
+import sys
+import threading
+import time
+
+from flask import g, has_request_context, request
+
+# Per-process request metrics rendered in the Prometheus text format. Each gunicorn worker keeps its own
+# numbers; Prometheus adds them up across scrape targets.
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+DB_TIME_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.sum += value
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                return
+        self.counts[-1] += 1
+
+    def render(self, name, labels):
+        lines, cumulative = [], 0
+        for bound, count in zip(self.buckets, self.counts):
+            cumulative += count
+            lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+        lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {sum(self.counts)}')
+        lines.append(f'{name}_sum{{{labels}}} {self.sum}')
+        lines.append(f'{name}_count{{{labels}}} {sum(self.counts)}')
+        return lines
+
+class InstrumentedCursor:
+    # Times every statement and charges it to the current request.
+    def __init__(self, cursor, slow_log):
+        self._cursor, self._slow_log = cursor, slow_log
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+    def _timed(self, method, operation, params):
+        started = time.perf_counter()
+        try:
+            return method(operation, params)
+        finally:
+            if has_request_context() and 'db_queries' in g:
+                elapsed = time.perf_counter() - started
+                g.db_queries += 1
+                g.db_seconds += elapsed
+                # Statements are logged without their parameters, which may hold passwords or private text.
+                if self._slow_log: g.db_statements.append((elapsed, operation))
+
+    def execute(self, operation, params=()):
+        return self._timed(self._cursor.execute, operation, params)
+
+    def executemany(self, operation, seq_params):
+        return self._timed(self._cursor.executemany, operation, seq_params)
+
+class RequestMetrics:
+    def __init__(self, slow_request_ms=0):
+        self.slow_request_ms = slow_request_ms
+        self._lock = threading.Lock()
+        self._latency, self._queries, self._db_time, self._size = {}, {}, {}, {}
+        self._requests = {}
+        self.slow_requests = 0
+
+    def init_app(self, app):
+        app.before_request(self._start)
+        app.after_request(self._finish)
+
+    def instrument_cursor(self, cursor):
+        return InstrumentedCursor(cursor, bool(self.slow_request_ms))
+
+    def _start(self):
+        g.request_started = time.perf_counter()
+        g.db_queries, g.db_seconds, g.db_statements = 0, 0.0, []
+
+    def _finish(self, response):
+        if 'request_started' not in g: return response
+        elapsed = time.perf_counter() - g.request_started
+        route = request.url_rule.rule if request.url_rule else 'unmatched'
+        key = (request.method, route)
+        # Measuring a streamed body would buffer it (and never return for the event stream).
+        size = None if response.is_streamed else response.calculate_content_length()
+        with self._lock:
+            self._latency.setdefault(key, Histogram(LATENCY_BUCKETS)).observe(elapsed)
+            self._queries.setdefault(key, Histogram(QUERY_BUCKETS)).observe(g.db_queries)
+            self._db_time.setdefault(key, Histogram(DB_TIME_BUCKETS)).observe(g.db_seconds)
+            if size is not None: self._size.setdefault(key, Histogram(SIZE_BUCKETS)).observe(size)
+            status_key = (*key, response.status_code)
+            self._requests[status_key] = self._requests.get(status_key, 0) + 1
+        if self.slow_request_ms and elapsed * 1000 >= self.slow_request_ms: self._log_slow(elapsed, response)
+        return response
+
+    def _log_slow(self, elapsed, response):
+        with self._lock: self.slow_requests += 1
+        lines = [f"Slow request: {request.method} {request.full_path.rstrip('?')} -> {response.status_code} in {elapsed * 1000:.0f}ms, "
+                 f"{g.db_queries} queries ({g.db_seconds * 1000:.0f}ms in MySQL)"]
+        lines += [f"    {seconds * 1000:7.1f}ms  {' '.join(statement.split())}" for seconds, statement in g.db_statements]
+        print('\n'.join(lines), file=sys.stderr)
+
+    def render(self, extra=()):
+        # `extra` holds (name, type, description, value) samples owned by other components.
+        out = []
+        with self._lock:
+            families = (('http_request_duration_seconds', 'Request latency by route.', self._latency),
+                        ('http_request_db_queries', 'Database statements executed per request.', self._queries),
+                        ('http_request_db_seconds', 'Time spent in database statements per request.', self._db_time),
+                        ('http_response_size_bytes', 'Response body size.', self._size))
+            for name, description, histograms in families:
+                out += [f'# HELP {name} {description}', f'# TYPE {name} histogram']
+                for (method, route), histogram in sorted(histograms.items()):
+                    out += histogram.render(name, f'method="{method}",route="{route}"')
+            out += ['# HELP http_requests_total Requests by route and status code.', '# TYPE http_requests_total counter']
+            for (method, route, status), count in sorted(self._requests.items()):
+                out.append(f'http_requests_total{{method="{method}",route="{route}",status="{status}"}} {count}')
+            out += ['# HELP http_slow_requests_total Requests over the slow request threshold.', '# TYPE http_slow_requests_total counter',
+                    f'http_slow_requests_total {self.slow_requests}']
+        for name, kind, description, value in extra:
+            out += [f'# HELP {name} {description}', f'# TYPE {name} {kind}', f'{name} {value}']
+        return '\n'.join(out) + '\n'
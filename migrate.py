@@ -0,0 +1,80 @@
+# migrate.py
+# Applies the numbered SQL files in migrations/ that have not been applied yet.
+#   python migrate.py            apply pending migrations
+#   python migrate.py --status   list applied and pending migrations
+import glob
+import os
+import re
+import sys
+import mysql.connector
+from config import Config
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'migrations')
+# Errors meaning a statement's change is already in place (duplicate column, table or key name).
+ALREADY_APPLIED = {1050, 1060, 1061}
+CREATE_INDEX = re.compile(r"CREATE\s+INDEX\s+(\w+)\s+ON\s+(\w+)\s*\(([^)]*)\)", re.IGNORECASE)
+
+def connect():
+    return mysql.connector.connect(host=Config.MYSQL_HOST, port=Config.MYSQL_PORT, user=Config.MYSQL_USER,
+                                   password=Config.MYSQL_PASSWORD, database=Config.MYSQL_DB)
+
+def split_statements(sql):
+    lines = [line for line in sql.splitlines() if not line.strip().startswith('--')]
+    return [statement.strip() for statement in '\n'.join(lines).split(';') if statement.strip()]
+
+def index_covered(cur, table, columns):
+    # True when an existing index on the table starts with exactly these columns.
+    cur.execute("SELECT index_name, column_name FROM information_schema.statistics WHERE table_schema = DATABASE() AND table_name = %s ORDER BY index_name, seq_in_index", (table,))
+    indexes = {}
+    for index_name, column_name in cur.fetchall(): indexes.setdefault(index_name, []).append(column_name.lower())
+    return any(existing[:len(columns)] == columns for existing in indexes.values())
+
+def apply_migration(connection, path):
+    cur = connection.cursor()
+    for statement in split_statements(open(path).read()):
+        match = CREATE_INDEX.match(statement)
+        if match:
+            columns = [column.strip().lower() for column in match.group(3).split(',')]
+            if index_covered(cur, match.group(2), columns):
+                print(f"    skipped {match.group(1)}: already covered by an existing index")
+                continue
+        try:
+            cur.execute(statement)
+        except mysql.connector.Error as err:
+            if err.errno not in ALREADY_APPLIED: raise
+            print(f"    skipped statement already in place: {err.msg}")
+    cur.execute("INSERT INTO schema_migrations (name) VALUES (%s)", (os.path.basename(path),))
+    connection.commit()
+    cur.close()
+
+def main(argv):
+    connection = connect()
+    cur = connection.cursor()
+    cur.execute("CREATE TABLE IF NOT EXISTS schema_migrations (name VARCHAR(255) PRIMARY KEY, applied_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP)")
+    cur.execute("SELECT name FROM schema_migrations")
+    applied = {row[0] for row in cur.fetchall()}
+    cur.close()
+    migrations = sorted(glob.glob(os.path.join(MIGRATIONS_DIR, '*.sql')))
+    pending = [path for path in migrations if os.path.basename(path) not in applied]
+
+    if '--status' in argv:
+        for path in migrations:
+            name = os.path.basename(path)
+            print(f"{'applied' if name in applied else 'pending'}  {name}")
+        return 0
+    if not pending:
+        print("--- Database schema is up to date. ---")
+        return 0
+    for path in pending:
+        print(f"--- Applying {os.path.basename(path)} ---")
+        try:
+            apply_migration(connection, path)
+        except mysql.connector.Error as err:
+            print(f"---!!! FAILED TO APPLY {os.path.basename(path)}: {err} !!!---", file=sys.stderr)
+            return 1
+    connection.close()
+    print("--- Migrations applied successfully. ---")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,13 @@
+-- Per-project change versions used by the incremental task sync (GET /projects/<id>/tasks?since=<version>).
+ALTER TABLE projects ADD COLUMN version BIGINT UNSIGNED NOT NULL DEFAULT 0;
+ALTER TABLE tasks ADD COLUMN version BIGINT UNSIGNED NOT NULL DEFAULT 0;
+CREATE INDEX idx_tasks_project_version ON tasks (project_id, version);
+
+-- One row per deleted task so clients that are behind can drop the card.
+CREATE TABLE task_tombstones (
+    project_id INT NOT NULL,
+    task_id INT NOT NULL,
+    version BIGINT UNSIGNED NOT NULL,
+    deleted_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (project_id, version, task_id)
+);
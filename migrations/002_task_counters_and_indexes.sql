@@ -0,0 +1,17 @@
+-- Counters maintained by the write routes so board reads no longer aggregate comments and subtasks.
+ALTER TABLE tasks
+    ADD COLUMN comment_count INT NOT NULL DEFAULT 0,
+    ADD COLUMN subtask_total INT NOT NULL DEFAULT 0,
+    ADD COLUMN subtask_done INT NOT NULL DEFAULT 0;
+
+UPDATE tasks SET
+    comment_count = (SELECT COUNT(*) FROM comments c WHERE c.task_id = tasks.id),
+    subtask_total = (SELECT COUNT(*) FROM subtasks s WHERE s.task_id = tasks.id),
+    subtask_done = (SELECT COUNT(*) FROM subtasks s WHERE s.task_id = tasks.id AND s.is_complete);
+
+-- Indexes behind the membership check, column paging, comment threads/previews and subtask lookups.
+-- migrate.py skips any of them an existing index already covers.
+CREATE INDEX idx_project_members_project_user ON project_members (project_id, user_id);
+CREATE INDEX idx_tasks_project_status_created ON tasks (project_id, status, created_at);
+CREATE INDEX idx_comments_task_created ON comments (task_id, created_at);
+CREATE INDEX idx_subtasks_task ON subtasks (task_id);
@@ -0,0 +1,4 @@
+-- FULLTEXT indexes behind /projects/<id>/search. InnoDB ignores words shorter than innodb_ft_min_token_size (3).
+CREATE FULLTEXT INDEX ft_tasks_content ON tasks (content);
+CREATE FULLTEXT INDEX ft_subtasks_content ON subtasks (content);
+CREATE FULLTEXT INDEX ft_comments_content ON comments (content);
@@ -0,0 +1,11 @@
+-- When a task last changed column; archive-tasks moves tasks that have been done for ARCHIVE_AFTER_DAYS.
+ALTER TABLE tasks ADD COLUMN status_changed_at TIMESTAMP NULL DEFAULT NULL;
+UPDATE tasks SET status_changed_at = created_at WHERE status_changed_at IS NULL;
+CREATE INDEX idx_tasks_status_changed ON tasks (status, status_changed_at);
+
+-- Archived tasks and their subtasks and comments, out of the way of board reads. They keep their ids.
+CREATE TABLE archived_tasks LIKE tasks;
+ALTER TABLE archived_tasks ADD COLUMN archived_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP;
+CREATE INDEX idx_archived_tasks_project_archived ON archived_tasks (project_id, archived_at);
+CREATE TABLE archived_subtasks LIKE subtasks;
+CREATE TABLE archived_comments LIKE comments;
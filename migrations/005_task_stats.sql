@@ -0,0 +1,28 @@
+-- Every change of column, written by the status routes; cycle times start at a task's first move to 'inprogress'.
+CREATE TABLE task_status_log (
+    id BIGINT UNSIGNED AUTO_INCREMENT PRIMARY KEY,
+    project_id INT NOT NULL,
+    task_id INT NOT NULL,
+    from_status VARCHAR(20) NOT NULL,
+    to_status VARCHAR(20) NOT NULL,
+    changed_at DATETIME NOT NULL,
+    KEY idx_task_status_log_task (task_id, to_status),
+    KEY idx_task_status_log_project (project_id, changed_at)
+);
+
+-- Per-project daily rollups behind /projects/<id>/stats, kept up to date by the same writes.
+CREATE TABLE project_daily_stats (
+    project_id INT NOT NULL,
+    day DATE NOT NULL,
+    created INT NOT NULL DEFAULT 0,
+    completed INT NOT NULL DEFAULT 0,
+    reopened INT NOT NULL DEFAULT 0,
+    cycle_seconds BIGINT NOT NULL DEFAULT 0,
+    PRIMARY KEY (project_id, day)
+);
+
+-- Tasks created before the rollups existed. Completions can't be recovered, so history starts with this migration.
+INSERT INTO project_daily_stats (project_id, day, created)
+    SELECT project_id, DATE(created_at), COUNT(*) FROM (SELECT project_id, created_at FROM tasks UNION ALL SELECT project_id, created_at FROM archived_tasks) AS all_tasks
+    WHERE created_at IS NOT NULL GROUP BY project_id, DATE(created_at)
+    ON DUPLICATE KEY UPDATE created = VALUES(created);
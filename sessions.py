@@ -0,0 +1,67 @@
+import re
+import secrets
+import time
+
+from flask.sessions import SessionInterface, SessionMixin
+from werkzeug.datastructures import CallbackDict
+
+# Server-side sessions. The cookie only carries a random session id; the data lives in a cache backend
+# (see cache.make_cache) and expires after SESSION_LIFETIME seconds without a request. Sessions can be
+# revoked one user at a time or all at once by storing a cutoff, in a store of its own: any session created
+# before it is void.
+
+_ALL = '*'
+# What secrets.token_urlsafe(32) produces; any other cookie value is ignored without a lookup.
+_SID = re.compile(r'^[A-Za-z0-9_-]{43}$')
+
+class ServerSideSession(CallbackDict, SessionMixin):
+    def __init__(self, initial=None, sid=None, created=None, touched=None):
+        def on_update(self):
+            self.modified = True
+        super().__init__(initial, on_update)
+        self.sid, self.created, self.touched = sid, created, touched
+        self.new = sid is None
+        self.modified = self.rotate = False
+
+    def regenerate(self):
+        # Issue a fresh id on the next response, so an id planted before login is useless afterwards.
+        self.rotate = self.modified = True
+
+class ServerSideSessionInterface(SessionInterface):
+    def __init__(self, store, cutoffs, lifetime, refresh_interval):
+        self.store, self.cutoffs, self.lifetime, self.refresh_interval = store, cutoffs, lifetime, refresh_interval
+
+    def open_session(self, app, request):
+        sid = request.cookies.get(self.get_cookie_name(app))
+        record = self.store.get(sid) if sid and _SID.match(sid) else None
+        if not isinstance(record, dict) or self.revoked(record): return ServerSideSession()
+        return ServerSideSession(record['data'], sid=sid, created=record['created'], touched=record['touched'])
+
+    def revoked(self, record):
+        user_id = record['data'].get('user_id')
+        cutoff = max(self.cutoffs.peek(_ALL, 0), self.cutoffs.peek(str(user_id), 0) if user_id else 0)
+        return record['created'] <= cutoff
+
+    def revoke(self, user_id=None):
+        # Ends every session of user_id, or every session when it is None. Cutoffs outlive the sessions they void.
+        self.cutoffs.set(_ALL if user_id is None else str(user_id), time.time(), ttl=self.lifetime)
+
+    def save_session(self, app, session, response):
+        name, domain, path = self.get_cookie_name(app), self.get_cookie_domain(app), self.get_cookie_path(app)
+        if not session:
+            if session.sid:
+                self.store.delete(session.sid)
+                response.delete_cookie(name, domain=domain, path=path, secure=self.get_cookie_secure(app),
+                                       httponly=self.get_cookie_httponly(app), samesite=self.get_cookie_samesite(app))
+            return
+        now = time.time()
+        if session.rotate and session.sid:
+            self.store.delete(session.sid)
+            session.sid = None
+        # Sliding expiry: an unchanged session is only written back once per refresh interval.
+        if not session.modified and session.sid and now - session.touched < self.refresh_interval: return
+        if session.sid is None: session.sid, session.created = secrets.token_urlsafe(32), now
+        self.store.set(session.sid, {'data': dict(session), 'created': session.created, 'touched': now}, ttl=self.lifetime)
+        response.set_cookie(name, session.sid, max_age=self.lifetime, domain=domain, path=path, secure=self.get_cookie_secure(app),
+                            httponly=self.get_cookie_httponly(app), samesite=self.get_cookie_samesite(app))
+        response.vary.add('Cookie')
@@ -1,20 +1,62 @@
 document.addEventListener('DOMContentLoaded', function() {
     const projectId = document.body.dataset.projectId;
+    const currentUserId = document.body.dataset.userId;
     let members = [];
     let allTasks = {};
     let currentTaskId = null;
+    let boardVersion = null;
+    let syncQueue = Promise.resolve();
+
+    // Columns load newest cards first, one page at a time, as they scroll into view.
+    const STATUSES = ['todo', 'inprogress', 'done'];
+    const PAGE_SIZE = 50;
+    let columnCursors = {};
+    let unloadedCounts = {};
+    let columnLoading = {};
+
+    // Search-as-you-type; tasks found by search but not loaded on the board yet are kept aside.
+    const SEARCH_MIN_LENGTH = 3;
+    let searchTimer = null;
+    let searchController = null;
+    let searchResultTasks = {};
 
     if (!projectId) return;
 
     initializeApp();
 
     function initializeApp() {
-        fetchMembers().then(fetchTasks);
+        fetchMembers().then(fetchTasks).then(subscribeToBoardEvents);
         initializeSortable();
+        observeColumnEnds();
         setupEventListeners();
         updateTaskCounts();
     }
 
+    // Collaborators' changes arrive as small events; we only pull the delta they point at.
+    function subscribeToBoardEvents() {
+        if (typeof EventSource === 'undefined') return;
+        const source = new EventSource(`/projects/${projectId}/events`);
+        const onBoardChange = (evt) => {
+            const event = JSON.parse(evt.data);
+            if (event.version && boardVersion !== null && event.version <= boardVersion) return;
+            syncTasks();
+        };
+        ['task.created', 'task.updated', 'task.moved', 'task.deleted', 'tasks.batch', 'tasks.archived', 'subtask.created', 'subtask.updated', 'resync']
+            .forEach(type => source.addEventListener(type, onBoardChange));
+        source.addEventListener('comment.created', (evt) => {
+            onBoardChange(evt);
+            const event = JSON.parse(evt.data);
+            const modal = document.getElementById('task-details-modal');
+            const ownComment = String(event.actor_id) === currentUserId;
+            if (!ownComment && String(event.task_id) === String(currentTaskId) && modal.style.display === 'block') {
+                fetchAndRenderComments(event.task_id);
+            }
+        });
+        source.addEventListener('member.added', () => fetchMembers());
+        // EventSource reconnects by itself; catch up on anything missed while it was away.
+        source.onopen = () => syncTasks();
+    }
+
     function initializeSortable() {
         if (typeof Sortable === 'undefined') return;
         const columns = document.querySelectorAll('.task-cards');
@@ -62,6 +104,7 @@ document.addEventListener('DOMContentLoaded', function() {
         document.getElementById('edit-task-form').addEventListener('submit', saveTaskDetails);
         document.getElementById('add-subtask-form').addEventListener('submit', addSubtask);
         document.getElementById('add-comment-form').addEventListener('submit', addComment);
+        setupSearch();
     }
 
     function clearModalForms() {
@@ -81,55 +124,202 @@ document.addEventListener('DOMContentLoaded', function() {
     }
 
     function updateTaskCounts() {
-        const todoCounts = document.querySelectorAll('#todo-tasks .task-card').length;
-        const inProgressCounts = document.querySelectorAll('#inprogress-tasks .task-card').length;
-        const doneCounts = document.querySelectorAll('#done-tasks .task-card').length;
-
-        document.getElementById('todo-count').textContent = todoCounts;
-        document.getElementById('inprogress-count').textContent = inProgressCounts;
-        document.getElementById('done-count').textContent = doneCounts;
+        // Cards on screen plus the ones the server told us are still to be paged in
+        STATUSES.forEach(status => {
+            const loaded = document.querySelectorAll(`#${status}-tasks .task-card`).length;
+            document.getElementById(`${status}-count`).textContent = loaded + (unloadedCounts[status] || 0);
+        });
     }
 
     // --- Task Functions ---
     async function fetchTasks() {
         try {
-            const response = await fetch(`/projects/${projectId}/tasks`);
-            const data = await response.json();
-            
+            const pages = await Promise.all(STATUSES.map(status => fetchTaskPage(status, null)));
+            // Deltas are pulled from the oldest version any column was read at
+            boardVersion = Math.min(...pages.map(page => page.version));
+
             // Clear and rebuild allTasks object
             allTasks = {};
-            Object.values(data).flat().forEach(task => { 
-                allTasks[task.id] = task; 
-            });
-            
-            renderTasks(data);
+            STATUSES.forEach(status => document.getElementById(`${status}-tasks`).innerHTML = '');
+            pages.forEach(appendTaskPage);
             updateTaskCounts();
+            STATUSES.forEach(loadMoreIfVisible);
         } catch (error) {
             console.error('Error fetching tasks:', error);
             showNotification('Error loading tasks', 'error');
         }
     }
 
-    function renderTasks(tasksByStatus) {
-        const columns = {
-            todo: document.getElementById('todo-tasks'),
-            inprogress: document.getElementById('inprogress-tasks'),
-            done: document.getElementById('done-tasks')
-        };
-        
-        // Clear all columns first
-        Object.values(columns).forEach(col => col.innerHTML = '');
-        
-        // Render tasks in their respective columns with staggered animation
-        for (const status in tasksByStatus) {
-            if (columns[status]) {
-                tasksByStatus[status].forEach((task, index) => {
-                    const taskCard = createTaskCard(task);
-                    taskCard.style.animationDelay = `${index * 0.1}s`;
-                    columns[status].appendChild(taskCard);
-                });
-            }
+    async function fetchTaskPage(status, after, limit = PAGE_SIZE) {
+        const params = new URLSearchParams({ status, limit });
+        if (after) params.set('after', after);
+        const response = await fetch(`/projects/${projectId}/tasks?${params}`);
+        if (!response.ok) throw new Error('Failed to load tasks');
+        return response.json();
+    }
+
+    function appendTaskPage(page) {
+        const column = document.getElementById(`${page.status}-tasks`);
+        let appended = 0;
+        page.tasks.forEach((task, index) => {
+            if (findTaskCard(task.id)) return; // Already shown through a delta
+            allTasks[task.id] = task;
+            const taskCard = createTaskCard(task);
+            taskCard.style.animationDelay = `${Math.min(index, 10) * 0.1}s`;
+            column.appendChild(taskCard);
+            appended++;
+        });
+        columnCursors[page.status] = page.next_cursor;
+        if (!page.next_cursor) {
+            unloadedCounts[page.status] = 0;
+        } else if (page.total !== undefined) {
+            unloadedCounts[page.status] = page.total - page.tasks.length;
+        } else {
+            unloadedCounts[page.status] = Math.max(0, (unloadedCounts[page.status] || 0) - appended);
+        }
+    }
+
+    async function loadMoreTasks(status) {
+        if (!columnCursors[status] || columnLoading[status]) return;
+        columnLoading[status] = true;
+        try {
+            appendTaskPage(await fetchTaskPage(status, columnCursors[status]));
+            updateTaskCounts();
+        } catch (error) {
+            console.error('Error loading more tasks:', error);
+            showNotification('Error loading tasks', 'error');
+        } finally {
+            columnLoading[status] = false;
+        }
+        loadMoreIfVisible(status);
+    }
+
+    // The observer only fires on changes, so keep going while the end of the column is still on screen
+    function loadMoreIfVisible(status) {
+        const sentinel = document.querySelector(`.column-sentinel[data-status="${status}"]`);
+        if (sentinel && sentinel.getBoundingClientRect().top < window.innerHeight + 200) loadMoreTasks(status);
+    }
+
+    function observeColumnEnds() {
+        if (typeof IntersectionObserver === 'undefined') return;
+        const observer = new IntersectionObserver(entries => {
+            entries.forEach(entry => {
+                if (entry.isIntersecting) loadMoreTasks(entry.target.dataset.status);
+            });
+        }, { rootMargin: '200px' });
+        STATUSES.forEach(status => {
+            const sentinel = document.createElement('div');
+            sentinel.className = 'column-sentinel';
+            sentinel.dataset.status = status;
+            document.getElementById(`${status}-tasks`).after(sentinel);
+            observer.observe(sentinel);
+        });
+    }
+
+    // Pulls only the tasks changed since the version we hold and patches the board in place.
+    // Calls are chained so deltas are always applied in order.
+    function syncTasks() {
+        syncQueue = syncQueue.then(applyTaskDelta, applyTaskDelta);
+        return syncQueue;
+    }
+
+    async function applyTaskDelta() {
+        if (boardVersion === null || Number.isNaN(boardVersion)) return fetchTasks();
+        try {
+            const response = await fetch(`/projects/${projectId}/tasks?since=${boardVersion}`);
+            if (!response.ok) throw new Error('Failed to sync tasks');
+            const delta = await response.json();
+            if (!Array.isArray(delta.tasks)) return fetchTasks(); // Server no longer knows our version
+            if (delta.version <= boardVersion) return;
+
+            // A change to a task we never paged in may leave a column size we cannot work out locally
+            const countsKnown = delta.deleted.map(removeTaskCard).concat(delta.tasks.map(upsertTaskCard)).every(Boolean);
+            boardVersion = delta.version;
+            if (!countsKnown) await refreshUnloadedCounts();
+            updateTaskCounts();
+        } catch (error) {
+            console.error('Error syncing tasks:', error);
+            showNotification('Error loading tasks', 'error');
+        }
+    }
+
+    function findTaskCard(taskId) {
+        return document.querySelector(`.task-card[data-task-id="${taskId}"]`);
+    }
+
+    // Columns are ordered newest first by (created_at, id); task positions carry that key in cursor form.
+    function isOlder(position, than) {
+        const [time, id] = position.split(/,(?=[^,]*$)/), [otherTime, otherId] = than.split(/,(?=[^,]*$)/);
+        return time < otherTime || (time === otherTime && Number(id) < Number(otherId));
+    }
+
+    // Whether a task sits past the last loaded page of a column, where it is counted but not shown
+    function isUnloaded(status, position) {
+        return Boolean(columnCursors[status] && position && isOlder(position, columnCursors[status]));
+    }
+
+    function takeUnloaded(status) {
+        unloadedCounts[status] = Math.max(0, (unloadedCounts[status] || 0) - 1);
+    }
+
+    // The remove and upsert helpers keep unloadedCounts in step with tasks that have no card, and
+    // return false when they cannot tell which column such a task was counted in.
+    function removeTaskCard(taskId) {
+        const task = allTasks[taskId];
+        delete allTasks[taskId];
+        const card = findTaskCard(taskId);
+        if (card) {
+            card.remove();
+        } else if (task) {
+            takeUnloaded(task.status);
+        } else {
+            // Either never paged in, or created and deleted since the last sync
+            return STATUSES.every(status => !unloadedCounts[status]);
+        }
+        return true;
+    }
+
+    function upsertTaskCard(task) {
+        const previous = allTasks[task.id];
+        allTasks[task.id] = task;
+        const column = document.getElementById(`${task.status}-tasks`);
+        if (!column) return true;
+        const existing = findTaskCard(task.id);
+        if (existing && existing.parentNode === column) {
+            existing.replaceWith(createTaskCard(task));
+            return true;
+        }
+        let known = true;
+        if (existing) {
+            existing.remove();
+        } else if (previous) {
+            takeUnloaded(previous.status);
+        } else {
+            // New tasks sort before every cursor; an older one was counted in a column it sorts past
+            const counted = STATUSES.filter(status => isUnloaded(status, task.position));
+            if (counted.length === 1) takeUnloaded(counted[0]);
+            known = counted.length <= 1;
+        }
+        if (!existing && isUnloaded(task.status, task.position)) {
+            // It will come in with a later page of its new column
+            unloadedCounts[task.status] = (unloadedCounts[task.status] || 0) + 1;
+            return known;
         }
+        const nextCard = Array.from(column.children).find(card => {
+            const shown = allTasks[card.dataset.taskId];
+            return shown && shown.position && task.position && isOlder(shown.position, task.position);
+        });
+        column.insertBefore(createTaskCard(task), nextCard || null);
+        return known;
+    }
+
+    // Re-reads the column sizes when a delta touched tasks we could not place
+    async function refreshUnloadedCounts() {
+        const pages = await Promise.all(STATUSES.filter(status => columnCursors[status]).map(status => fetchTaskPage(status, null, 1)));
+        pages.forEach(page => {
+            const shown = document.querySelectorAll(`#${page.status}-tasks .task-card`).length;
+            unloadedCounts[page.status] = Math.max(0, page.total - shown);
+        });
     }
 
     // ENHANCED: Task card now shows detailed subtasks and comments with authors
@@ -140,9 +330,10 @@ document.addEventListener('DOMContentLoaded', function() {
 
         // Build subtasks section with author information
         let subtasksHTML = '';
-        if (task.subtasks && task.subtasks.length > 0) {
-            const completedCount = task.subtasks.filter(st => st.is_complete).length;
-            const totalCount = task.subtasks.length;
+        if (task.subtask_total > 0 && task.subtasks) {
+            // Counters are maintained by the server
+            const completedCount = task.subtask_done;
+            const totalCount = task.subtask_total;
             
             subtasksHTML = `
                 <div class="card-subtasks">
@@ -180,7 +371,7 @@ document.addEventListener('DOMContentLoaded', function() {
                         Comments (${commentCount})
                     </div>
                     <div class="card-comment-preview" data-task-id="${task.id}">
-                        <div style="opacity: 0.6; font-style: italic;">Loading comments...</div>
+                        ${renderCommentPreview(task.comment_preview || [], commentCount)}
                     </div>
                 </div>
             `;
@@ -221,11 +412,6 @@ document.addEventListener('DOMContentLoaded', function() {
                 <div class="assignee">${escapeHTML(task.assignee_name) || 'Unassigned'}</div>
             </div>`;
         
-        // Load comments for this card if they exist
-        if (commentCount > 0) {
-            loadCardComments(task.id);
-        }
-        
         card.addEventListener('click', () => openTaskDetails(task.id));
         
         // Add hover effects
@@ -248,27 +434,14 @@ document.addEventListener('DOMContentLoaded', function() {
         return author ? author.name : 'Unknown';
     }
 
-    // NEW: Function to load comments for display on cards with author info
-    async function loadCardComments(taskId) {
-        try {
-            const response = await fetch(`/projects/${projectId}/tasks/${taskId}/comments`);
-            if (response.ok) {
-                const comments = await response.json();
-                const previewElement = document.querySelector(`[data-task-id="${taskId}"] .card-comment-preview`);
-                
-                if (previewElement && comments.length > 0) {
-                    const recentComments = comments.slice(-2); // Show last 2 comments
-                    previewElement.innerHTML = recentComments.map(comment => `
-                        <div class="card-comment-item">
-                            <span class="comment-author">${escapeHTML(comment.author)}:</span>
-                            <span class="comment-text">${escapeHTML(comment.content.substring(0, 60))}${comment.content.length > 60 ? '...' : ''}</span>
-                        </div>
-                    `).join('') + (comments.length > 2 ? `<div class="card-more">+${comments.length - 2} more comments...</div>` : '');
-                }
-            }
-        } catch (error) {
-            console.error('Error loading card comments:', error);
-        }
+    // Card previews come embedded in the task payload (latest comments, oldest first)
+    function renderCommentPreview(comments, commentCount) {
+        return comments.map(comment => `
+            <div class="card-comment-item">
+                <span class="comment-author">${escapeHTML(comment.author)}:</span>
+                <span class="comment-text">${escapeHTML(comment.content.substring(0, 60))}${comment.content.length > 60 ? '...' : ''}</span>
+            </div>
+        `).join('') + (commentCount > comments.length ? `<div class="card-more">+${commentCount - comments.length} more comments...</div>` : '');
     }
 
     async function addTask(event) {
@@ -290,7 +463,7 @@ document.addEventListener('DOMContentLoaded', function() {
             if (response.ok) {
                 form.closest('.modal').style.display = 'none';
                 form.reset();
-                await fetchTasks();
+                await syncTasks();
                 showNotification('Task added successfully!', 'success');
             } else {
                 throw new Error('Failed to add task');
@@ -304,7 +477,7 @@ document.addEventListener('DOMContentLoaded', function() {
     // ENHANCED: Task details modal with better animations and user experience
     async function openTaskDetails(taskId) {
         currentTaskId = taskId;
-        const task = allTasks[taskId];
+        const task = allTasks[taskId] || searchResultTasks[taskId];
         if (!task) return;
 
         // Show loading state
@@ -455,7 +628,7 @@ document.addEventListener('DOMContentLoaded', function() {
             
             if (response.ok) {
                 form.closest('.modal').style.display = 'none';
-                await fetchTasks(); // Refresh tasks to show updated content
+                await syncTasks(); // Patch the updated card in place
                 showNotification('Task updated successfully!', 'success');
             } else {
                 throw new Error('Failed to update task');
@@ -466,22 +639,42 @@ document.addEventListener('DOMContentLoaded', function() {
         }
     }
 
-    async function updateTaskStatus(taskId, newStatus) {
+    // Drag-and-drop moves are collected for a short moment and sent as one batch request.
+    const pendingMoves = new Map();
+    let moveFlushTimer = null;
+
+    function updateTaskStatus(taskId, newStatus) {
+        pendingMoves.set(Number(taskId), newStatus);
+        if (allTasks[taskId]) allTasks[taskId].status = newStatus;
+        updateTaskCounts();
+        clearTimeout(moveFlushTimer);
+        moveFlushTimer = setTimeout(flushTaskMoves, 400);
+    }
+
+    async function flushTaskMoves() {
+        if (pendingMoves.size === 0) return;
+        const operations = Array.from(pendingMoves, ([id, status]) => ({ op: 'status', id, status }));
+        pendingMoves.clear();
+
         try {
-            const response = await fetch(`/projects/${projectId}/tasks/${taskId}/status`, {
-                method: 'PUT',
+            const response = await fetch(`/projects/${projectId}/tasks/batch`, {
+                method: 'POST',
                 headers: { 'Content-Type': 'application/json' },
-                body: JSON.stringify({ status: newStatus })
+                body: JSON.stringify({ operations })
             });
-            
-            if (response.ok && allTasks[taskId]) {
-                allTasks[taskId].status = newStatus;
-                updateTaskCounts();
-                showNotification('Task moved successfully!', 'success');
+            if (!response.ok) throw new Error('Failed to move tasks');
+            const data = await response.json();
+            const moved = data.results.filter(result => result.status === 'ok').length;
+            await syncTasks();
+            if (moved < operations.length) {
+                showNotification('Some tasks no longer exist on this board', 'warning');
+            } else {
+                showNotification(moved === 1 ? 'Task moved successfully!' : `${moved} tasks moved successfully!`, 'success');
             }
         } catch (error) {
             console.error('Error updating task status:', error);
             showNotification('Error moving task', 'error');
+            await fetchTasks(); // Put the cards back where the server has them
         }
     }
 
@@ -495,7 +688,7 @@ document.addEventListener('DOMContentLoaded', function() {
             
             if (response.ok) {
                 document.getElementById('task-details-modal').style.display = 'none';
-                await fetchTasks(); 
+                await syncTasks();
                 showNotification('Task deleted successfully!', 'success');
             } else {
                 throw new Error('Failed to delete task');
@@ -579,13 +772,13 @@ document.addEventListener('DOMContentLoaded', function() {
     async function fetchAndRenderSubtasks(taskId) {
         try {
             // Get the specific task's subtasks from our stored data
-            const task = allTasks[taskId];
+            const task = allTasks[taskId] || searchResultTasks[taskId];
             if (task && task.subtasks) {
                 renderSubtasks(task.subtasks);
             } else {
-                // If no subtasks in memory, fetch fresh data
-                await fetchTasks();
-                const updatedTask = allTasks[taskId];
+                // If no subtasks in memory, pull the latest changes
+                await syncTasks();
+                const updatedTask = allTasks[taskId] || searchResultTasks[taskId];
                 if (updatedTask && updatedTask.subtasks) {
                     renderSubtasks(updatedTask.subtasks);
                 }
@@ -650,8 +843,8 @@ document.addEventListener('DOMContentLoaded', function() {
 
             if (response.ok) {
                 form.reset();
-                // Refresh the main tasks data first, then update subtasks display
-                await fetchTasks();
+                // Patch the main tasks data first, then update subtasks display
+                await syncTasks();
                 await fetchAndRenderSubtasks(currentTaskId);
                 showNotification('Subtask added successfully!', 'success');
             } else {
@@ -680,8 +873,8 @@ document.addEventListener('DOMContentLoaded', function() {
                         subtask.is_complete = isComplete;
                     }
                 }
-                // Refresh main board to update counts
-                await fetchTasks();
+                // Patch the card to update counts
+                await syncTasks();
                 showNotification(`Subtask ${isComplete ? 'completed' : 'reopened'}!`, 'success');
             }
         } catch (error) {
@@ -749,7 +942,7 @@ document.addEventListener('DOMContentLoaded', function() {
                 // Refresh both comments and main board
                 await Promise.all([
                     fetchAndRenderComments(currentTaskId),
-                    fetchTasks() // This updates comment counts on cards
+                    syncTasks() // This updates comment counts on cards
                 ]);
                 showNotification('Comment added successfully!', 'success');
             } else {
@@ -762,6 +955,92 @@ document.addEventListener('DOMContentLoaded', function() {
     }
 
     // --- Utility Functions ---
+    // --- Search Functions ---
+    function setupSearch() {
+        const input = document.getElementById('board-search');
+        const list = document.getElementById('search-results');
+        input.addEventListener('input', () => {
+            clearTimeout(searchTimer);
+            searchTimer = setTimeout(() => searchBoard(input.value.trim()), 250);
+        });
+        input.addEventListener('keydown', (event) => {
+            if (event.key === 'Escape') {
+                input.value = '';
+                hideSearchResults();
+            }
+        });
+        input.addEventListener('focus', () => {
+            if (list.children.length) list.classList.add('open');
+        });
+        document.addEventListener('click', (event) => {
+            if (!event.target.closest('.board-search')) hideSearchResults();
+        });
+    }
+
+    async function searchBoard(query, offset = 0) {
+        // Only the latest keystroke's request matters.
+        if (searchController) searchController.abort();
+        if (query.length < SEARCH_MIN_LENGTH) {
+            hideSearchResults();
+            document.getElementById('search-results').innerHTML = '';
+            return;
+        }
+        searchController = new AbortController();
+        try {
+            const params = new URLSearchParams({ q: query });
+            if (offset) params.set('offset', offset);
+            const response = await fetch(`/projects/${projectId}/search?${params}`, { signal: searchController.signal });
+            if (!response.ok) throw new Error('Search failed');
+            renderSearchResults(query, await response.json(), offset > 0);
+        } catch (error) {
+            if (error.name === 'AbortError') return;
+            console.error('Error searching tasks:', error);
+            showNotification('Error searching tasks', 'error');
+        }
+    }
+
+    function renderSearchResults(query, results, append) {
+        const list = document.getElementById('search-results');
+        if (!append) list.innerHTML = '';
+        list.querySelector('.search-more')?.remove();
+        results.tasks.forEach(task => { searchResultTasks[task.id] = task; });
+
+        results.hits.forEach(hit => {
+            const task = allTasks[hit.task_id] || searchResultTasks[hit.task_id];
+            const item = document.createElement('button');
+            item.type = 'button';
+            item.className = 'search-result';
+            // Snippets come escaped from the server with matches wrapped in <mark>.
+            item.innerHTML = `
+                <span class="search-result-type">${escapeHTML(hit.type)}</span>
+                <span class="search-result-snippet">${hit.snippet}</span>
+                ${hit.type !== 'task' && task ? `<span class="search-result-task">on ${escapeHTML(task.content)}</span>` : ''}
+            `;
+            item.onclick = () => {
+                hideSearchResults();
+                openTaskDetails(hit.task_id);
+            };
+            list.appendChild(item);
+        });
+
+        if (!list.children.length) {
+            list.innerHTML = '<div class="search-empty">No matching tasks, subtasks or comments</div>';
+        }
+        if (results.next_offset !== null) {
+            const more = document.createElement('button');
+            more.type = 'button';
+            more.className = 'btn btn-secondary search-more';
+            more.textContent = 'More results';
+            more.onclick = () => searchBoard(query, results.next_offset);
+            list.appendChild(more);
+        }
+        list.classList.add('open');
+    }
+
+    function hideSearchResults() {
+        document.getElementById('search-results').classList.remove('open');
+    }
+
     function escapeHTML(str) {
         if (str === null || str === undefined) return '';
         const div = document.createElement('div');
@@ -0,0 +1,75 @@
+import glob
+import os
+import shutil
+import subprocess
+
+import pytest
+
+import assets
+
+STATIC = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'static')
+
+@pytest.fixture(autouse=True)
+def builtin_minifiers(monkeypatch):
+    # Test the built-in minifiers even where rjsmin/rcssmin are installed.
+    monkeypatch.setattr(assets, 'rjsmin', None)
+    monkeypatch.setattr(assets, 'rcssmin', None)
+
+def test_js_strips_comments_and_indentation():
+    source = "// header\nfunction f(a, b) {\n    /* block\n       comment */\n    return a + b;  // trailing\n}\n"
+    assert assets.minify_js(source) == "function f(a, b) {\nreturn a + b;\n}\n"
+
+def test_js_keeps_line_breaks_for_semicolon_insertion():
+    assert assets.minify_js("let a = 1\nlet b = a\n\n\n(b)\n") == "let a = 1\nlet b = a\n(b)\n"
+
+@pytest.mark.parametrize('literal', [
+    '"// not a comment"',
+    "'/* nor this */'",
+    '"escaped \\" quote // still a string"',
+    "'it\\'s   spaced'",
+])
+def test_js_keeps_strings(literal):
+    assert assets.minify_js(f"const s = {literal};  // note\n") == f"const s = {literal};\n"
+
+@pytest.mark.parametrize('literal', [
+    '`plain  //  text`',
+    '`a ${b} /* c */ d`',
+    '`outer ${cond ? `inner ${x}  // y` : "}"} end`',
+    '`line one\n    line two`',
+    '`${ {a: 1}.a }  `',
+    '`escaped \\` tick  // not a comment`',
+])
+def test_js_keeps_template_literals(literal):
+    assert assets.minify_js(f"const t = {literal};\n") == f"const t = {literal};\n"
+
+@pytest.mark.parametrize('literal', [
+    '/\\/\\/[a-z]+/g',
+    '/[/]  +/',
+    '/  +/g',
+    '/a\\/  b/i',
+    '/"/',
+])
+def test_js_keeps_regex_literals(literal):
+    assert assets.minify_js(f"x = s.replace({literal}, '');\n") == f"x = s.replace({literal}, '');\n"
+    assert assets.minify_js(f"return {literal}.test(s);\n") == f"return {literal}.test(s);\n"
+
+def test_js_division_is_not_a_regex():
+    # Read as a regex, each '/' would swallow the following comment.
+    assert assets.minify_js("const r = a / b;  // b / c\nconst q = (x) / 2;  /* half / */\n") == "const r = a / b;\nconst q = (x) / 2;\n"
+
+def test_js_keyword_suffix_is_an_identifier():
+    # `preturn` ends like `return`, but a '/' after it divides.
+    assert assets.minify_js("v = preturn / 2;  // a / b\n") == "v = preturn / 2;\n"
+
+def test_css_keeps_strings_and_drops_comments():
+    source = 'a::before {\n  content: "/* kept */  ;";  /* dropped */\n  margin: 0 auto;\n}\n'
+    assert assets.minify_css(source) == 'a::before{content:"/* kept */  ;";margin:0 auto}'
+
+@pytest.mark.skipif(shutil.which('node') is None, reason="node is not installed")
+@pytest.mark.parametrize('path', sorted(glob.glob(os.path.join(STATIC, 'js', '**', '*.js'), recursive=True)))
+def test_shipped_scripts_still_parse(path, tmp_path):
+    with open(path, encoding='utf-8') as f: minified = assets.minify_js(f.read())
+    target = tmp_path / os.path.basename(path)
+    target.write_text(minified, encoding='utf-8')
+    result = subprocess.run(['node', '--check', str(target)], capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
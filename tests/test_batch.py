@@ -0,0 +1,106 @@
+import os
+import sqlite3
+
+import pytest
+
+# Set before app is imported: its config is read once at import time.
+os.environ.update({'SESSION_BACKEND': 'memory', 'CACHE_BACKEND': 'memory', 'EVENT_BROKER': 'memory', 'ASSETS_BUILD': 'never', 'BCRYPT_LOG_ROUNDS': '4',
+                   'AUTH_BURST_PER_IP': '1000', 'AUTH_BURST_PER_EMAIL': '1000'})
+
+import app as board
+from bench import sqlite_mysql
+from db import ConnectionPool
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    # A fresh SQLite stand-in for every test; ids start over, so the caches keyed by them are emptied too.
+    path = str(tmp_path / 'board.sqlite3')
+    sqlite_mysql.create_database(path)
+    monkeypatch.setattr(board, 'db_pool', ConnectionPool(lambda: sqlite_mysql.connect(path), size=2, ping_after=60))
+    for cache in (board.user_context_cache, board.board_cache, board.app.session_interface.store): cache.clear()
+    connection = sqlite3.connect(path)
+    yield connection
+    connection.close()
+
+@pytest.fixture
+def client(db):
+    client = board.app.test_client()
+    client.post('/signup', json={'name': 'Ada', 'email': 'ada@example.com', 'password': 'secret'})
+    assert client.post('/login', json={'email': 'ada@example.com', 'password': 'secret'}).status_code == 200
+    assert client.post('/projects', json={'name': 'Board', 'description': ''}).status_code == 201
+    for content in ('first', 'second', 'third'): client.post('/projects/1/tasks', json={'content': content})
+    return client
+
+def batch(client, *operations):
+    return client.post('/projects/1/tasks/batch', json={'operations': list(operations)})
+
+def task(db, task_id):
+    row = db.execute("SELECT content, status, priority, subtask_total, subtask_done, version FROM tasks WHERE id = ?", (task_id,)).fetchone()
+    return dict(zip(('content', 'status', 'priority', 'subtask_total', 'subtask_done', 'version'), row)) if row else None
+
+@pytest.mark.parametrize('operation, error', [
+    ({'op': 'delete', 'id': True}, 'An integer id is required'),
+    ({'op': 'status', 'id': '1', 'status': 'done'}, 'An integer id is required'),
+    ({'op': 'archive', 'id': 1}, 'Unknown operation'),
+    ('delete', 'Unknown operation'),
+    ({'op': 'create'}, 'Task content is required'),
+    ({'op': 'update', 'id': 1, 'content': 'x'}, 'Missing required fields'),
+    ({'op': 'status', 'id': 1, 'status': 'blocked'}, 'Invalid status'),
+    ({'op': 'subtask', 'id': 1, 'is_complete': 1}, 'is_complete must be a boolean'),
+])
+def test_invalid_operation_rejects_the_whole_batch(client, db, operation, error):
+    response = batch(client, {'op': 'delete', 'id': 2}, operation)
+    assert response.status_code == 400
+    assert response.get_json()['details'] == [{'index': 1, 'error': error}]
+    assert task(db, 1) is not None and task(db, 2) is not None
+
+def test_empty_and_oversized_batches_are_rejected(client, monkeypatch):
+    assert batch(client).status_code == 400
+    monkeypatch.setitem(board.app.config, 'BATCH_MAX_OPERATIONS', 2)
+    assert batch(client, *[{'op': 'create', 'content': 'x'}] * 3).status_code == 400
+
+def test_mixed_operations_on_the_same_task(client, db):
+    response = batch(client,
+                     {'op': 'update', 'id': 1, 'content': 'renamed', 'priority': 'high'},
+                     {'op': 'status', 'id': 1, 'status': 'inprogress'},
+                     {'op': 'status', 'id': 1, 'status': 'done'},
+                     {'op': 'update', 'id': 2, 'content': 'gone soon', 'priority': 'low'},
+                     {'op': 'delete', 'id': 2},
+                     {'op': 'status', 'id': 99, 'status': 'done'},
+                     {'op': 'create', 'content': 'fourth'})
+    assert response.status_code == 200
+    body = response.get_json()
+    assert [result['status'] for result in body['results']] == ['ok'] * 5 + ['not_found', 'ok']
+    assert body['results'][6]['id'] == 4
+    assert task(db, 1) == {'content': 'renamed', 'status': 'done', 'priority': 'high', 'subtask_total': 0, 'subtask_done': 0, 'version': body['version']}
+    # The delete supersedes the update before it, and leaves a tombstone for ?since= clients.
+    assert task(db, 2) is None
+    assert db.execute("SELECT task_id, version FROM task_tombstones").fetchall() == [(2, body['version'])]
+    # Every real column change is logged, in order.
+    assert db.execute("SELECT from_status, to_status FROM task_status_log WHERE task_id = 1 ORDER BY id").fetchall() == [('todo', 'inprogress'), ('inprogress', 'done')]
+    delta = client.get(f"/projects/1/tasks?since={body['version'] - 1}").get_json()
+    assert sorted(t['id'] for t in delta['tasks']) == [1, 4] and delta['deleted'] == [2]
+
+def test_subtask_toggles_adjust_the_done_counter(client, db):
+    for content in ('a', 'b', 'c'): client.post('/projects/1/subtasks', json={'task_id': 1, 'content': content})
+    client.post('/projects/1/subtasks', json={'task_id': 2, 'content': 'd'})
+    response = batch(client,
+                     {'op': 'subtask', 'id': 1, 'is_complete': True},
+                     {'op': 'subtask', 'id': 2, 'is_complete': True},
+                     {'op': 'subtask', 'id': 2, 'is_complete': False},
+                     {'op': 'subtask', 'id': 3, 'is_complete': False},
+                     {'op': 'subtask', 'id': 4, 'is_complete': True})
+    assert response.status_code == 200
+    assert task(db, 1)['subtask_total'] == 3 and task(db, 1)['subtask_done'] == 1
+    assert task(db, 2)['subtask_done'] == 1
+    assert db.execute("SELECT id FROM subtasks WHERE is_complete ORDER BY id").fetchall() == [(1,), (4,)]
+    # Completing an already complete subtask changes nothing.
+    batch(client, {'op': 'subtask', 'id': 1, 'is_complete': True}, {'op': 'subtask', 'id': 4, 'is_complete': False})
+    assert task(db, 1)['subtask_done'] == 1 and task(db, 2)['subtask_done'] == 0
+
+def test_batch_only_reaches_tasks_of_its_project(client, db):
+    client.post('/projects', json={'name': 'Other', 'description': ''})
+    client.post('/projects/2/tasks', json={'content': 'elsewhere'})
+    response = batch(client, {'op': 'delete', 'id': 4}, {'op': 'status', 'id': 4, 'status': 'done'})
+    assert [result['status'] for result in response.get_json()['results']] == ['not_found', 'not_found']
+    assert task(db, 4)['status'] == 'todo'
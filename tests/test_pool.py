@@ -0,0 +1,118 @@
+import threading
+import time
+
+import pytest
+
+from db import ConnectionPool, PoolTimeout
+
+class FakeConnection:
+    def __init__(self, driver):
+        self.driver, self.closed, self.rollbacks, self.in_transaction = driver, False, 0, True
+        self.ping_error = None
+
+    def ping(self, reconnect=False):
+        if self.ping_error: raise self.ping_error
+
+    def rollback(self):
+        self.rollbacks += 1
+
+    def close(self):
+        with self.driver.lock:
+            if not self.closed: self.driver.live -= 1
+            self.closed = True
+
+class FakeDriver:
+    # Counts connections opened over its lifetime, and the most ever open at once.
+    def __init__(self):
+        self.opened, self.live, self.peak = [], 0, 0
+        self.lock = threading.Lock()
+
+    def connect(self):
+        with self.lock:
+            self.opened.append(FakeConnection(self))
+            self.live += 1
+            self.peak = max(self.peak, self.live)
+            return self.opened[-1]
+
+def make_pool(**kwargs):
+    driver = FakeDriver()
+    return driver, ConnectionPool(driver.connect, **{'size': 2, 'max_overflow': 1, 'timeout': 0.2, 'ping_after': 60, **kwargs})
+
+def test_returned_connection_is_reused_and_rolled_back():
+    driver, pool = make_pool()
+    first = pool.get_connection()
+    first.close()
+    second = pool.get_connection()
+    assert len(driver.opened) == 1
+    assert second._cnx is driver.opened[0]
+    assert driver.opened[0].rollbacks == 1
+    second.close()
+    assert pool.stats()['in_use'] == 0
+
+def test_closing_twice_returns_the_connection_once():
+    _, pool = make_pool()
+    connection = pool.get_connection()
+    connection.close()
+    connection.close()
+    assert not connection.is_connected()
+    assert pool.stats()['idle'] == 1
+
+def test_never_opens_more_than_size_plus_overflow():
+    driver, pool = make_pool(timeout=2)
+    limit, in_use, peak, lock = 3, [0], [0], threading.Lock()
+
+    def borrow():
+        connection = pool.get_connection()
+        with lock:
+            in_use[0] += 1
+            peak[0] = max(peak[0], in_use[0])
+        time.sleep(0.01)
+        with lock: in_use[0] -= 1
+        connection.close()
+
+    threads = [threading.Thread(target=borrow) for _ in range(30)]
+    for thread in threads: thread.start()
+    for thread in threads: thread.join()
+    assert peak[0] <= limit
+    assert driver.peak <= limit
+    assert pool.stats()['open'] <= pool.size
+    assert pool.stats()['timeouts'] == 0
+
+def test_times_out_when_exhausted():
+    _, pool = make_pool()
+    held = [pool.get_connection() for _ in range(3)]
+    with pytest.raises(PoolTimeout):
+        pool.get_connection()
+    assert pool.stats()['timeouts'] == 1
+    held[0].close()
+    pool.get_connection().close()
+
+def test_waiter_gets_a_connection_released_meanwhile():
+    _, pool = make_pool(timeout=2)
+    held = [pool.get_connection() for _ in range(3)]
+    threading.Timer(0.05, held[0].close).start()
+    connection = pool.get_connection()
+    assert connection.is_connected()
+    assert pool.stats()['waits'] == 1
+
+def test_stale_idle_connection_is_replaced():
+    driver, pool = make_pool(ping_after=0)
+    pool.get_connection().close()
+    driver.opened[0].ping_error = OSError("gone away")
+    connection = pool.get_connection()
+    assert connection._cnx is driver.opened[1]
+    assert driver.opened[0].closed
+    assert pool.stats()['stale_discarded'] == 1
+
+def test_failed_connect_frees_its_slot():
+    attempts = []
+
+    def connect():
+        attempts.append(1)
+        raise OSError("refused")
+
+    pool = ConnectionPool(connect, size=1, max_overflow=0, timeout=0.1, connect_retries=1, retry_delay=0)
+    with pytest.raises(OSError):
+        pool.get_connection()
+    assert len(attempts) == 2
+    assert pool.stats()['open'] == 0